@@ -1,4 +1,5 @@
 from typing import Dict, Any, List
+import asyncio
 import os
 import json
 import logging
@@ -157,7 +158,8 @@ class AIFilter:
             elif self.provider == "openai":
                 return await self._filter_with_openai(data, prompt)
             else:
-                return await self._smart_extraction(data, prompt)
+                # Pure regex/parsing work - run it in a thread so other pages' I/O keeps moving
+                return await asyncio.to_thread(self._smart_extraction, data, prompt)
         except Exception as e:
             logger.error(f"AI filtering failed: {e}")
             # Return original data on failure
@@ -166,21 +168,78 @@ class AIFilter:
     async def _filter_with_gemini(self, data: Dict[str, Any], prompt: str) -> List[Dict[str, Any]]:
         """Use Google Gemini to extract data"""
         try:
-            # Prepare the content for AI
-            content_text = self._prepare_content(data)
-            
-            # Check if we have section-based data
-            sections = data.get('sections', {})
-            has_sections = bool(sections)
+            # Building the prompt serializes the page - keep that off the event loop
+            ai_prompt = await asyncio.to_thread(self._build_gemini_prompt, data, prompt)
+
+            # Try to generate content, with fallback model retry. Concurrent jobs share this
+            # AIFilter, so each call works on its own reference and only a working model is published.
+            model = self.model
+            try:
+                response = await asyncio.to_thread(model.generate_content, ai_prompt)
+                result_text = response.text.strip()
+            except Exception as model_error:
+                # If model error, try to reinitialize with a different model
+                if "404" in str(model_error) or "not found" in str(model_error).lower():
+                    logger.warning(f"Model not found, trying to reinitialize with fallback models: {model_error}")
+                    import google.generativeai as genai
+                    
+                    # Try fallback models in order
+                    fallback_models = ['gemini-2.5-flash-lite', 'gemini-pro', 'gemini-1.5-pro']
+                    last_error = None
+                    for fallback_model in fallback_models:
+                        try:
+                            model = genai.GenerativeModel(fallback_model)
+                            response = await asyncio.to_thread(model.generate_content, ai_prompt)
+                            result_text = response.text.strip()
+                            self.model = model
+                            logger.info(f"Successfully used fallback model {fallback_model}")
+                            break
+                        except Exception as fallback_error:
+                            last_error = fallback_error
+                            logger.debug(f"Fallback model {fallback_model} failed: {fallback_error}")
+                            continue
+                    else:
+                        # All fallbacks failed
+                        logger.error(f"All fallback models failed. Last error: {last_error}")
+                        raise model_error  # Raise original error
+                else:
+                    raise
             
-            # Enhanced prompt for comprehensive restaurant data extraction
-            is_comprehensive_restaurant = any(keyword in prompt.lower() for keyword in [
-                'all', 'everything', 'complete', 'comprehensive', 'amenities', 
-                'menu url', 'internal data', 'all data'
-            ])
+            # Clean up the response (remove markdown code blocks if present)
+            result_text = self._clean_json_response(result_text)
             
-            if is_comprehensive_restaurant:
-                system_instruction = """You are an expert restaurant data extraction assistant. Extract EVERY piece of restaurant-related information available, including:
+            # Parse JSON response
+            try:
+                extracted = json.loads(result_text)
+                if isinstance(extracted, list):
+                    return extracted if extracted else [data]
+                else:
+                    return [extracted]
+            except json.JSONDecodeError:
+                logger.warning(f"Failed to parse Gemini response as JSON: {result_text[:200]}")
+                return [{"ai_extracted": result_text, "original_url": data.get("url")}]
+                
+        except Exception as e:
+            logger.error(f"Gemini extraction failed: {e}")
+            raise
+
+    def _build_gemini_prompt(self, data: Dict[str, Any], prompt: str) -> str:
+        """Build the Gemini extraction prompt for a page (blocking - call via a thread)"""
+        # Prepare the content for AI
+        content_text = self._prepare_content(data)
+        
+        # Check if we have section-based data
+        sections = data.get('sections', {})
+        has_sections = bool(sections)
+        
+        # Enhanced prompt for comprehensive restaurant data extraction
+        is_comprehensive_restaurant = any(keyword in prompt.lower() for keyword in [
+            'all', 'everything', 'complete', 'comprehensive', 'amenities', 
+            'menu url', 'internal data', 'all data'
+        ])
+        
+        if is_comprehensive_restaurant:
+            system_instruction = """You are an expert restaurant data extraction assistant. Extract EVERY piece of restaurant-related information available, including:
 - Basic info (name, description, website, social media)
 - Contact (phone, email, all formats)
 - Location (full address, GPS, parking, transit)
@@ -197,15 +256,15 @@ class AIFilter:
 - Any other restaurant-related information
 
 Be extremely thorough - extract every available detail, no matter how small."""
-            else:
-                system_instruction = "You are a data extraction assistant. Extract information based on the user's request."
-            
-            # Add section-based categorization instructions if sections are available
-            section_instructions = ""
-            if has_sections:
-                # Prepare sections JSON outside f-string to avoid backslash issues
-                sections_json = json.dumps(sections, indent=2)[:2000]
-                section_instructions = f"""
+        else:
+            system_instruction = "You are a data extraction assistant. Extract information based on the user's request."
+        
+        # Add section-based categorization instructions if sections are available
+        section_instructions = ""
+        if has_sections:
+            # Prepare sections JSON outside f-string to avoid backslash issues
+            sections_json = json.dumps(sections, indent=2)[:2000]
+            section_instructions = f"""
 
 IMPORTANT - SECTION-BASED CATEGORIZATION:
 The page content is organized into sections with titles. Use these section titles to categorize the extracted data.
@@ -221,16 +280,16 @@ INSTRUCTIONS FOR SECTION CATEGORIZATION:
 5. Create a structure like: {{"section_name": {{"field1": "value1", "field2": "value2"}}}}
 6. If data doesn't fit into any section, use a "General" or "Other" category
 7. Preserve the section structure while extracting all relevant data"""
-            
-            # Prepare example format (outside f-string to avoid backslash issues)
-            if has_sections:
-                example_format = 'Example format with sections: [{"name": "Restaurant", "sections": {"Amenities & More": {"amenities": ["Wi-Fi", "Parking"]}, "Location & Hours": {"address": "123 Main St", "hours": "Mon-Fri: 9am-5pm"}}}]'
-            else:
-                example_format = 'Example format: [{"name": "Restaurant", "menu_urls": {"main": "url1", "lunch": "url2"}, "amenities": ["Wi-Fi", "Parking"]}]'
-            
-            section_org_instruction = "ORGANIZE DATA BY SECTION TITLES if sections are available" if has_sections else ""
-            
-            ai_prompt = f"""{system_instruction}
+        
+        # Prepare example format (outside f-string to avoid backslash issues)
+        if has_sections:
+            example_format = 'Example format with sections: [{"name": "Restaurant", "sections": {"Amenities & More": {"amenities": ["Wi-Fi", "Parking"]}, "Location & Hours": {"address": "123 Main St", "hours": "Mon-Fri: 9am-5pm"}}}]'
+        else:
+            example_format = 'Example format: [{"name": "Restaurant", "menu_urls": {"main": "url1", "lunch": "url2"}, "amenities": ["Wi-Fi", "Parking"]}]'
+        
+        section_org_instruction = "ORGANIZE DATA BY SECTION TITLES if sections are available" if has_sections else ""
+        
+        return f"""{system_instruction}
 
 USER REQUEST: {prompt}
 {section_instructions}
@@ -256,61 +315,13 @@ Return ONLY valid JSON, no explanations or markdown.
 
 JSON OUTPUT:"""
 
-            # Try to generate content, with fallback model retry
-            try:
-                response = self.model.generate_content(ai_prompt)
-                result_text = response.text.strip()
-            except Exception as model_error:
-                # If model error, try to reinitialize with a different model
-                if "404" in str(model_error) or "not found" in str(model_error).lower():
-                    logger.warning(f"Model not found, trying to reinitialize with fallback models: {model_error}")
-                    import google.generativeai as genai
-                    
-                    # Try fallback models in order
-                    fallback_models = ['gemini-2.5-flash-lite', 'gemini-pro', 'gemini-1.5-pro']
-                    last_error = None
-                    for fallback_model in fallback_models:
-                        try:
-                            self.model = genai.GenerativeModel(fallback_model)
-                            response = self.model.generate_content(ai_prompt)
-                            result_text = response.text.strip()
-                            logger.info(f"Successfully used fallback model {fallback_model}")
-                            break
-                        except Exception as fallback_error:
-                            last_error = fallback_error
-                            logger.debug(f"Fallback model {fallback_model} failed: {fallback_error}")
-                            continue
-                    else:
-                        # All fallbacks failed
-                        logger.error(f"All fallback models failed. Last error: {last_error}")
-                        raise model_error  # Raise original error
-                else:
-                    raise
-            
-            # Clean up the response (remove markdown code blocks if present)
-            result_text = self._clean_json_response(result_text)
-            
-            # Parse JSON response
-            try:
-                extracted = json.loads(result_text)
-                if isinstance(extracted, list):
-                    return extracted if extracted else [data]
-                else:
-                    return [extracted]
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse Gemini response as JSON: {result_text[:200]}")
-                return [{"ai_extracted": result_text, "original_url": data.get("url")}]
-                
-        except Exception as e:
-            logger.error(f"Gemini extraction failed: {e}")
-            raise
-
     async def _filter_with_openai(self, data: Dict[str, Any], prompt: str) -> List[Dict[str, Any]]:
         """Use OpenAI GPT to extract data"""
         try:
-            content_text = self._prepare_content(data)
+            content_text = await asyncio.to_thread(self._prepare_content, data)
             
-            response = self.openai_client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.openai_client.chat.completions.create,
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -349,7 +360,7 @@ Return ONLY a JSON array of extracted items. No explanations."""
             logger.error(f"OpenAI extraction failed: {e}")
             raise
 
-    async def _smart_extraction(self, data: Dict[str, Any], prompt: str) -> List[Dict[str, Any]]:
+    def _smart_extraction(self, data: Dict[str, Any], prompt: str) -> List[Dict[str, Any]]:
         """
         Smart extraction without AI API.
         Automatically detects page type and extracts structured data.
@@ -390,10 +401,10 @@ Return ONLY a JSON array of extracted items. No explanations."""
             result["phones"] = self._extract_phones(data)
         
         if any(word in prompt_lower for word in ["link", "url", "href"]):
-            result["links"] = data.get("links", [])[:20]
+            result["links"] = {k: v[:20] for k, v in (data.get("links") or {}).items()}
         
         if any(word in prompt_lower for word in ["image", "picture", "photo", "img"]):
-            result["images"] = data.get("images", [])[:20]
+            result["images"] = {k: v[:20] for k, v in (data.get("images") or {}).items()}
         
         if any(word in prompt_lower for word in ["heading", "title", "h1", "h2"]):
             result["headings"] = data.get("headings", {})
@@ -424,23 +435,22 @@ Return ONLY a JSON array of extracted items. No explanations."""
         main_content = data.get("main_content") or data.get("text_content") or ""
         
         # Method 3: Extract from images (alt text often has business names)
-        images = data.get("images", [])
+        images = data.get("images") or {}
         image_map = {}
-        for img in images:
-            alt = img.get("alt") or img.get("title") or ""
+        for src, img_alt, img_title in zip(images.get("srcs", []), images.get("alts", []), images.get("titles", [])):
+            alt = img_alt or img_title or ""
             if alt and len(alt) > 3:
                 # Clean up common suffixes
                 name = re.sub(r'\s+on Yelp$', '', alt)
                 name = re.sub(r'\s+- TripAdvisor$', '', name)
                 if name:
-                    image_map[name.lower()] = img.get("src", "")
+                    image_map[name.lower()] = src
         
         # Method 4: Extract from links
-        links = data.get("links", [])
+        links = data.get("links") or {}
         link_map = {}
-        for link in links:
-            text = link.get("text", "").strip()
-            href = link.get("href", "")
+        for text, href in zip(links.get("texts", []), links.get("hrefs", [])):
+            text = text.strip()
             if text and len(text) > 3 and len(text) < 100:
                 link_map[text.lower()] = href
         
@@ -566,8 +576,8 @@ Return ONLY a JSON array of extracted items. No explanations."""
             categories = []
             
             # Look for category links associated with this business
-            for link in links:
-                link_text = link.get("text", "").lower()
+            for link_text in links.get("texts", []):
+                link_text = (link_text or "").lower()
                 if link_text in category_keywords:
                     # Check if this link is near the business in the content
                     categories.append(link_text.title())
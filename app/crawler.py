@@ -1,27 +1,91 @@
 import asyncio
-from typing import Dict, Any, List, Set, Optional
+from typing import Dict, Any, List, Iterator, Optional
 from urllib.parse import urljoin, urlparse, urlunparse, quote_plus
 from collections import deque
+import hashlib
+import math
 import re
 import logging
 from .scraper import WebScraper
+from .robots_cache import RobotsCache
 
 logger = logging.getLogger(__name__)
 
+# Seconds a single page scrape may take: crawls skip the page, single-URL jobs give up
+PAGE_TIMEOUT = 90
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set for URL dedup: a few bits per URL instead of a full set entry.
+    Membership checks can return false positives at roughly `error_rate`, never false negatives.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k bit positions derived from one 128-bit digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
 
 class WebCrawler:
     """
     General-purpose web crawler that can discover and scrape multiple pages
     """
     
-    def __init__(self, max_pages: int = 10, max_depth: int = 2, same_domain: bool = True):
-        self.scraper = WebScraper()
+    def __init__(
+        self,
+        max_pages: int = 10,
+        max_depth: int = 2,
+        same_domain: bool = True,
+        scraper: Optional[WebScraper] = None,
+        robots: Optional[RobotsCache] = None,
+        page_timeout: Optional[float] = PAGE_TIMEOUT
+    ):
+        # Reuse the caller's scraper (and its browser) when given one
+        self.scraper = scraper or WebScraper()
+        # Discovered links are checked against robots.txt when a cache is given
+        self.robots = robots
+        self.page_timeout = page_timeout
         self.max_pages = max_pages
         self.max_depth = max_depth
         self.same_domain = same_domain
-        self.visited_urls: Set[str] = set()
+        # Built by crawl(), sized for the max_pages in effect then (crawl_from_search may change it)
+        self.visited_urls: Optional[BloomFilter] = None
         self.results: List[Dict[str, Any]] = []
         
+    def with_limits(self, max_pages: int, max_depth: int, same_domain: bool) -> 'WebCrawler':
+        """
+        New crawler with the given limits that shares this one's scraper (HTTP client and browser).
+        Crawl state is per instance, so concurrent jobs each need their own.
+        """
+        return WebCrawler(
+            max_pages=max_pages,
+            max_depth=max_depth,
+            same_domain=same_domain,
+            scraper=self.scraper,
+            robots=self.robots,
+            page_timeout=self.page_timeout
+        )
+    
+    def _new_visited_filter(self) -> BloomFilter:
+        """Seen-URL filter sized for every link a full crawl can queue (up to 100 per page)"""
+        return BloomFilter(capacity=max(1000, self.max_pages * 100))
+    
     async def crawl(
         self, 
         start_urls: List[str], 
@@ -31,7 +95,7 @@ class WebCrawler:
         """
         Crawl the web starting from seed URLs
         """
-        self.visited_urls.clear()
+        self.visited_urls = self._new_visited_filter()
         self.results.clear()
         
         # Normalize and validate start URLs
@@ -54,10 +118,18 @@ class WebCrawler:
             if depth > self.max_depth:
                 continue
             
+            # Seed URLs were asked for explicitly; only discovered links honour robots.txt
+            if depth > 0 and self.robots and not await self.robots.allowed(url):
+                logger.info(f"Skipping {url}: disallowed by robots.txt")
+                continue
+            
             try:
                 logger.info(f"Crawling: {url} (depth: {depth})")
                 # Scrape the page
-                page_data = await self.scraper.scrape(url, use_javascript=use_javascript)
+                page_data = await asyncio.wait_for(
+                    self.scraper.scrape(url, use_javascript=use_javascript),
+                    timeout=self.page_timeout
+                )
                 
                 # Filter by keywords if provided
                 if keywords:
@@ -76,29 +148,35 @@ class WebCrawler:
                 
                 # Extract links for further crawling
                 if depth < self.max_depth and len(self.results) < self.max_pages:
-                    links = page_data.get('links', [])
+                    links = page_data.get('links') or {}
                     base_domain = self._get_domain(url)
+                    # Up to 100 links per page - bind the per-link lookups once
+                    normalize_url = self._normalize_url
+                    should_follow_link = self._should_follow_link
+                    visited_urls = self.visited_urls
+                    next_depth = depth + 1
                     
-                    for link_info in links:
-                        link_url = link_info.get('href') if isinstance(link_info, dict) else link_info
-                        
+                    for link_url in links.get('hrefs', []):
                         if not link_url:
                             continue
                         
                         full_url = urljoin(url, link_url)
-                        normalized = self._normalize_url(full_url)
+                        normalized = normalize_url(full_url)
                         
                         if not normalized:
                             continue
                         
-                        if self._should_follow_link(normalized, base_domain):
-                            if normalized not in self.visited_urls:
-                                self.visited_urls.add(normalized)
-                                queue.append((normalized, depth + 1))
+                        if should_follow_link(normalized, base_domain):
+                            if normalized not in visited_urls:
+                                visited_urls.add(normalized)
+                                queue.append((normalized, next_depth))
                 
                 # Small delay to be respectful
                 await asyncio.sleep(0.5)
                 
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out crawling {url} after {self.page_timeout}s")
+                continue
             except Exception as e:
                 logger.warning(f"Error crawling {url}: {str(e)}")
                 continue
@@ -291,13 +369,11 @@ class WebCrawler:
                 # Use JavaScript rendering for better results
                 search_results = await self.scraper.scrape(search_url, use_javascript=True)
                 
-                links = search_results.get('links', [])
+                links = search_results.get('links') or {}
                 
-                for link in links:
+                for href in links.get('hrefs', []):
                     if len(result_urls) >= max_results:
                         break
-                        
-                    href = link.get('href') if isinstance(link, dict) else link
                     
                     if not href:
                         continue
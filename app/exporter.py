@@ -24,3 +24,42 @@ class DataExporter:
         df.to_excel(buffer, index=False, engine='openpyxl')
         buffer.seek(0)
         return buffer.getvalue()
+
+    @staticmethod
+    def to_parquet(data: List[Dict[str, Any]]) -> bytes:
+        """Export data to Parquet bytes (columnar, zstd-compressed)"""
+        import pyarrow.parquet as pq
+
+        buffer = BytesIO()
+        pq.write_table(DataExporter._to_arrow_table(data), buffer, compression='zstd')
+        return buffer.getvalue()
+
+    @staticmethod
+    def to_feather(data: List[Dict[str, Any]]) -> bytes:
+        """Export data to Feather (Arrow IPC) bytes"""
+        import pyarrow.feather as feather
+
+        buffer = BytesIO()
+        feather.write_feather(DataExporter._to_arrow_table(data), buffer, compression='zstd')
+        return buffer.getvalue()
+
+    @staticmethod
+    def _to_arrow_table(data: List[Dict[str, Any]]):
+        """Build an Arrow table from result rows - nested dicts/lists are stored as JSON strings"""
+        import pyarrow as pa
+
+        rows = [item if isinstance(item, dict) else {'value': item} for item in data]
+
+        # Rows from different pages rarely share the same keys, so use the union of all of them
+        keys = list(dict.fromkeys(key for row in rows for key in row))
+
+        columns = {}
+        for key in keys:
+            values = [row.get(key) for row in rows]
+            values = [json.dumps(v, default=str) if isinstance(v, (dict, list)) else v for v in values]
+            try:
+                columns[key] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Mixed value types in one column - fall back to text
+                columns[key] = pa.array([None if v is None else str(v) for v in values])
+        return pa.table(columns)
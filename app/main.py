@@ -1,13 +1,16 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException, Query, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from typing import Optional
+import asyncio
 import uuid
 import json
 import os
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from datetime import datetime
 
 from .models import ScrapeJobCreate, ScrapeJob, ScrapeResult, JobStatus, ParseHTMLRequest, ExtractInternalDataRequest, ExtractFromIndividualPagesRequest
@@ -15,8 +18,13 @@ from .storage import Storage
 from .worker import ScraperWorker
 from .exporter import DataExporter
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging. Records go through a queue and a background thread writes them,
+# so slow stderr I/O never blocks the event loop.
+log_queue = SimpleQueue()
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+log_listener.handlers[0].setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -58,6 +66,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Initialize storage and worker (lazy initialization to handle missing credentials gracefully)
 storage = None
 worker = None
+job_queue = None
+job_runner = None
 exporter = DataExporter()
 
 def get_storage():
@@ -82,6 +92,29 @@ def get_worker():
         worker = ScraperWorker(storage_instance=storage_instance)
     return worker
 
+def get_job_queue():
+    """Get the job queue, starting the worker's consumers on first use"""
+    global job_queue, job_runner
+    if job_queue is None:
+        worker_instance = get_worker()
+        job_queue = asyncio.Queue()
+        job_runner = asyncio.create_task(worker_instance.run_forever(job_queue))
+    return job_queue
+
+
+@app.on_event("shutdown")
+async def shutdown_worker():
+    """Stop the job consumers and close the worker's shared browser on shutdown"""
+    if job_runner is not None:
+        job_runner.cancel()
+        try:
+            await job_runner
+        except asyncio.CancelledError:
+            pass
+    if worker is not None:
+        await worker.aclose()
+    log_listener.stop()
+
 
 # Serve frontend static files if they exist
 dist_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "dist")
@@ -166,7 +199,7 @@ async def debug_info():
     try:
         storage_instance = get_storage()
         # Try a simple query to verify connection
-        response = storage_instance.client.table('scrape_jobs').select('id').limit(1).execute()
+        response = await asyncio.to_thread(storage_instance.client.table('scrape_jobs').select('id').limit(1).execute)
         debug_info["database"] = {
             "status": "connected",
             "table_accessible": True
@@ -200,9 +233,11 @@ async def debug_recent_jobs():
         storage_instance = get_storage()
         
         # Get last 10 jobs
-        response = storage_instance.client.table('scrape_jobs').select(
-            'id, url, status, error, created_at, crawl_mode, search_query, use_javascript'
-        ).order('created_at', desc=True).limit(10).execute()
+        response = await asyncio.to_thread(
+            storage_instance.client.table('scrape_jobs').select(
+                'id, url, status, error, created_at, crawl_mode, search_query, use_javascript'
+            ).order('created_at', desc=True).limit(10).execute
+        )
         
         jobs = []
         for job in (response.data or []):
@@ -238,7 +273,7 @@ async def parse_html(request: ParseHTMLRequest):
     """
     try:
         from bs4 import BeautifulSoup
-        from .scraper import WebScraper
+        from .scraper import WebScraper, HTML_PARSER
         from .ai_filter import AIFilter
         
         if not request.html or len(request.html.strip()) < 100:
@@ -247,20 +282,15 @@ async def parse_html(request: ParseHTMLRequest):
         logger.info(f"Parsing HTML content ({len(request.html)} chars)")
         
         # Parse with BeautifulSoup - keep scripts first to extract JSON
-        soup_with_scripts = BeautifulSoup(request.html, 'html.parser')
+        soup = BeautifulSoup(request.html, HTML_PARSER)
         
-        # Extract embedded JSON data BEFORE removing scripts
+        # Extract embedded JSON data BEFORE scripts are removed
         scraper = WebScraper()
         source_url = request.source_url or "pasted-html"
-        embedded_data = scraper._extract_embedded_json(soup_with_scripts, source_url)
-        
-        # Now remove scripts for text extraction
-        soup = BeautifulSoup(request.html, 'html.parser')
-        for element in soup(['script', 'style', 'noscript']):
-            element.decompose()
+        embedded_data = scraper._extract_embedded_json(soup, source_url)
         
-        # Extract structured data
-        data = await scraper._extract_structured_data(soup, source_url, request.html)
+        # Extract structured data (drops script/style/noscript as it goes)
+        data = scraper._extract_structured_data(soup, source_url, request.html)
         data['source'] = 'pasted_html'
         data['html_length'] = len(request.html)
         
@@ -466,6 +496,7 @@ async def extract_internal_data(request: ExtractInternalDataRequest):
     
     This is perfect for sites where data is loaded dynamically and not in the initial HTML.
     """
+    scraper = None
     try:
         from .scraper import WebScraper
         from .ai_filter import AIFilter
@@ -564,6 +595,10 @@ async def extract_internal_data(request: ExtractInternalDataRequest):
     except Exception as e:
         logger.error(f"Internal data extraction failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to extract internal data: {str(e)}")
+    finally:
+        # Shut down the browser this request's scraper may have launched
+        if scraper is not None:
+            await scraper.aclose()
 
 
 @app.post("/extract-from-individual-pages")
@@ -581,6 +616,7 @@ async def extract_from_individual_pages(request: ExtractFromIndividualPagesReque
     
     Perfect for getting complete data that's only available on individual pages.
     """
+    scraper = None
     try:
         from .scraper import WebScraper
         from .ai_filter import AIFilter
@@ -651,6 +687,10 @@ async def extract_from_individual_pages(request: ExtractFromIndividualPagesReque
     except Exception as e:
         logger.error(f"Individual page extraction failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to extract from individual pages: {str(e)}")
+    finally:
+        # Shut down the browser this request's scraper may have launched
+        if scraper is not None:
+            await scraper.aclose()
 
 
 # ============ YELP API ENDPOINTS ============
@@ -737,7 +777,7 @@ async def test_get_job(job_id: str):
         storage_instance = get_storage()
         
         # Try to fetch raw data
-        response = storage_instance.client.table('scrape_jobs').select('*').eq('id', job_id).limit(1).execute()
+        response = await asyncio.to_thread(storage_instance.client.table('scrape_jobs').select('*').eq('id', job_id).limit(1).execute)
         
         if not response.data or len(response.data) == 0:
             return JSONResponse(
@@ -783,11 +823,11 @@ async def test_get_job(job_id: str):
 
 
 @app.post("/jobs", response_model=ScrapeJob, status_code=201)
-async def create_job(job_request: ScrapeJobCreate, background_tasks: BackgroundTasks):
+async def create_job(job_request: ScrapeJobCreate):
     """Create a new scraping job"""
     try:
         storage_instance = get_storage()
-        worker_instance = get_worker()
+        queue = get_job_queue()
         
         job_id = str(uuid.uuid4())
         
@@ -835,25 +875,8 @@ async def create_job(job_request: ScrapeJobCreate, background_tasks: BackgroundT
         if not job:
             raise HTTPException(status_code=500, detail="Failed to create job")
         
-        # Process job in background with proper error handling
-        # FastAPI BackgroundTasks supports async functions directly
-        async def process_job_wrapper():
-            """Wrapper to ensure background task errors are logged"""
-            try:
-                await worker_instance.process_job(job_id)
-            except Exception as e:
-                logger.error(f"Background task failed for job {job_id}: {str(e)}", exc_info=True)
-                # Update job status to failed
-                try:
-                    storage = get_storage()
-                    await storage.update_job(job_id, {
-                        'status': JobStatus.FAILED.value,
-                        'error': str(e)
-                    })
-                except Exception as update_error:
-                    logger.error(f"Failed to update job status: {update_error}")
-        
-        background_tasks.add_task(process_job_wrapper)
+        # Process job in background; the worker's consumers pick it up from the queue
+        queue.put_nowait(job_id)
         logger.info(f"Job {job_id} created and queued for processing")
         
         return job
@@ -1158,8 +1181,9 @@ async def get_job_results(job_id: str):
     
     # Extract data from results
     data = [result.get('data', result) for result in results]
-    
-    return ScrapeResult(
+
+    # Rows come straight from our own results table, so skip validating every item again
+    return ScrapeResult.model_construct(
         job_id=job_id,
         data=data,
         total_items=len(data),
@@ -1170,7 +1194,15 @@ async def get_job_results(job_id: str):
 @app.get("/jobs/{job_id}/export")
 async def export_job_results(
     job_id: str,
-    format: str = Query("json", regex="^(json|csv|excel)$")
+    format: str = Query(
+        "json",
+        regex="^(json|csv|excel|parquet|feather)$",
+        description=(
+            "Export format. parquet and feather are columnar binary formats that are much "
+            "faster to write and smaller than csv/excel for large jobs; nested values are "
+            "stored as JSON strings."
+        )
+    )
 ):
     """Export job results in specified format"""
     storage_instance = get_storage()
@@ -1215,3 +1247,17 @@ async def export_job_results(
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename=scrape_results_{job_id}.xlsx"}
         )
+    elif format == "parquet":
+        parquet_bytes = exporter.to_parquet(data)
+        return Response(
+            content=parquet_bytes,
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f"attachment; filename=scrape_results_{job_id}.parquet"}
+        )
+    elif format == "feather":
+        feather_bytes = exporter.to_feather(data)
+        return Response(
+            content=feather_bytes,
+            media_type="application/vnd.apache.arrow.file",
+            headers={"Content-Disposition": f"attachment; filename=scrape_results_{job_id}.feather"}
+        )
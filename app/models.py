@@ -1,5 +1,6 @@
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List, Dict, Any
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -20,7 +21,7 @@ class ScrapeJobCreate(BaseModel):
     same_domain: Optional[bool] = True  # Only crawl same domain
     filters: Optional[Dict[str, Any]] = None
     ai_prompt: Optional[str] = None
-    export_format: Optional[str] = "json"
+    export_format: Optional[str] = "json"  # json, csv, excel, parquet or feather
     use_javascript: Optional[bool] = False  # Use Playwright for JS-rendered pages
     extract_individual_pages: Optional[bool] = True  # Extract from individual restaurant pages (for listing pages) - DEFAULT: enabled
 
@@ -71,3 +72,46 @@ class ScrapeResult(BaseModel):
     data: List[Dict[str, Any]]
     total_items: int
     filtered_items: int
+
+
+@dataclass(slots=True, frozen=True)
+class ScrapeJobInternal:
+    """
+    Job settings as consumed by the worker.
+    Pydantic validation happens once at the API boundary; the worker only needs
+    a lightweight, read-only view of the stored job row.
+    """
+    id: str
+    url: Optional[str] = None
+    search_query: Optional[str] = None
+    crawl_mode: bool = False
+    max_pages: int = 10
+    max_depth: int = 2
+    same_domain: bool = True
+    filters: Optional[Dict[str, Any]] = None
+    ai_prompt: Optional[str] = None
+    export_format: str = "json"
+    use_javascript: bool = False
+    extract_individual_pages: bool = True
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "ScrapeJobInternal":
+        """Build from a scrape_jobs row - NULL columns fall back to the column defaults"""
+        def value(key: str, default: Any) -> Any:
+            found = record.get(key)
+            return default if found is None else found
+
+        return cls(
+            id=str(record["id"]),
+            url=record.get("url"),
+            search_query=record.get("search_query"),
+            crawl_mode=value("crawl_mode", False),
+            max_pages=value("max_pages", 10),
+            max_depth=value("max_depth", 2),
+            same_domain=value("same_domain", True),
+            filters=record.get("filters"),
+            ai_prompt=record.get("ai_prompt"),
+            export_format=value("export_format", "json"),
+            use_javascript=value("use_javascript", False),
+            extract_individual_pages=value("extract_individual_pages", True),
+        )
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# How long a fetched robots.txt is trusted (seconds)
+ROBOTS_TTL = 6 * 60 * 60
+
+# Retry sooner when robots.txt couldn't be fetched (network error or 5xx)
+ROBOTS_ERROR_TTL = 5 * 60
+
+# Hosts kept before the least recently used entry is dropped
+ROBOTS_CACHE_SIZE = 10_000
+
+# Only the first 500 KB of a robots.txt is parsed, as Google does
+MAX_ROBOTS_BYTES = 500 * 1024
+
+
+class RobotsCache:
+    """
+    Process-wide robots.txt cache: one fetch per host every ROBOTS_TTL seconds, shared by all crawls.
+    Concurrent lookups for an uncached host wait on a single fetch.
+    """
+
+    def __init__(self, user_agent: Optional[str] = None, ttl: float = ROBOTS_TTL, maxsize: int = ROBOTS_CACHE_SIZE):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # origin -> (parser, expires_at), least recently used first
+        self._entries: 'OrderedDict[str, Tuple[RobotFileParser, float]]' = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def allowed(self, url: str) -> bool:
+        """Check whether robots.txt for the URL's host lets us fetch it"""
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc:
+            return True
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        parser = self._get(origin)
+        if parser is None:
+            lock = self._locks.setdefault(origin, asyncio.Lock())
+            async with lock:
+                # Another lookup may have fetched it while we waited
+                parser = self._get(origin)
+                if parser is None:
+                    parser, ttl = await self._fetch(origin)
+                    self._put(origin, parser, ttl)
+            self._locks.pop(origin, None)
+
+        return parser.can_fetch(self.user_agent or '*', url)
+
+    def _get(self, origin: str) -> Optional[RobotFileParser]:
+        entry = self._entries.get(origin)
+        if entry is None:
+            return None
+        parser, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[origin]
+            return None
+        self._entries.move_to_end(origin)
+        return parser
+
+    def _put(self, origin: str, parser: RobotFileParser, ttl: float) -> None:
+        self._entries[origin] = (parser, time.monotonic() + ttl)
+        self._entries.move_to_end(origin)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def _fetch(self, origin: str) -> Tuple[RobotFileParser, float]:
+        """Fetch and parse robots.txt, following RobotFileParser.read()'s status handling"""
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=10,
+                follow_redirects=True,
+                headers={'User-Agent': self.user_agent} if self.user_agent else None
+            )
+
+        try:
+            async with self._client.stream("GET", parser.url) as response:
+                if response.status_code in (401, 403):
+                    parser.disallow_all = True
+                    return parser, self.ttl
+                if response.status_code >= 500:
+                    # Server trouble - don't block the crawl, but check again soon
+                    parser.allow_all = True
+                    return parser, ROBOTS_ERROR_TTL
+                if response.status_code >= 400:
+                    parser.allow_all = True
+                    return parser, self.ttl
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= MAX_ROBOTS_BYTES:
+                        break
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not fetch {parser.url}: {e}")
+            parser.allow_all = True
+            return parser, ROBOTS_ERROR_TTL
+
+        parser.parse(bytes(body[:MAX_ROBOTS_BYTES]).decode('utf-8', errors='ignore').splitlines())
+        return parser, self.ttl
+
+    async def aclose(self) -> None:
+        """Close the HTTP client used for robots.txt fetches"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,27 +1,171 @@
+import asyncio
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Any, List, Optional
+from bs4 import BeautifulSoup, Tag
+from typing import Dict, Any, Callable, List, Literal, Optional
 import httpx
 import re
 from urllib.parse import urljoin, urlparse, quote_plus
 import json
 import logging
+from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
 
+# Largest response body _scrape_static will buffer; longer bodies are truncated
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+
+# Concurrent scrapes allowed against one host, so a single busy site can't take every slot
+MAX_CONCURRENCY_PER_HOST = 16
+
+
+class UnsupportedContentError(ValueError):
+    """The URL serves something other than HTML/XML (PDF, image, archive...)"""
+
+# Prefer the C-backed lxml parser; fall back to the pure-Python one on source-only installs
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# orjson decodes large JSON blobs several times faster than the stdlib; use it when installed.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Embedded JSON blobs larger than this are skipped instead of decoded
+MAX_SCRIPT_JSON_CHARS = 2_000_000
+
+
+def _loads_json_text(raw: Optional[str]) -> Any:
+    """Decode an embedded JSON blob; None when it is empty or over MAX_SCRIPT_JSON_CHARS"""
+    if not raw or len(raw) > MAX_SCRIPT_JSON_CHARS:
+        return None
+    # bs4 hands back a str subclass, which orjson rejects
+    return _json_loads(str(raw))
+
+
+def _loads_script_json(script: Tag) -> Any:
+    """Decode the JSON body of a script tag"""
+    return _loads_json_text(script.string)
+
+# Class-name heuristics for page type detection
+_PRODUCT_RE = re.compile(r'product|item', re.I)
+_POSTENTRY_RE = re.compile(r'post|entry', re.I)
+
+# Bumped when the shape of scraped page data changes.
+# v2: links and images are column-oriented -
+#     links = {'texts': [...], 'hrefs': [...], 'titles': [...]}
+#     images = {'srcs': [...], 'alts': [...], 'titles': [...]}
+RESULT_SCHEMA_VERSION = 2
+
+# Hrefs that are already absolute and are used as-is
+ABSOLUTE_URL_PREFIXES = ('http://', 'https://')
+
+# Elements whose contents are never page text
+SKIPPED_TAGS = frozenset({'script', 'style', 'noscript'})
+
+# HTTP/2 needs the h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Only advertise brotli when a decoder is installed - httpx decodes it transparently
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+OPENTABLE_SEARCH_URL = (
+    "https://www.opentable.com/s?dateTime=2024-12-15T19:00&covers=2&term={term}"
+    "&queryUnderstandingType=location&locationString={location}"
+)
+
+
+# Playwright resource types aborted during JS scrapes. Stylesheets are still loaded:
+# lazy-load triggers depend on layout.
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+
+async def _block_heavy_resources(route) -> None:
+    """Playwright route handler that aborts BLOCKED_RESOURCE_TYPES requests"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _url_resolver(base_url: str) -> Callable[[str], str]:
+    """
+    Build an href resolver for one page. The base URL is parsed once; absolute,
+    protocol-relative and root-relative hrefs are assembled directly, anything else
+    (relative paths, dot segments) goes through urljoin.
+    """
+    base = urlparse(base_url)
+    if not (base.scheme and base.netloc):
+        return lambda href: urljoin(base_url, href)
+    scheme_prefix = base.scheme + ':'
+    origin = f'{base.scheme}://{base.netloc}'
+    
+    def resolve(href: str) -> str:
+        if href.startswith(ABSOLUTE_URL_PREFIXES):
+            return href
+        if '/.' not in href:
+            if href.startswith('//'):
+                return scheme_prefix + href
+            if href.startswith('/'):
+                return origin + href
+        return urljoin(base_url, href)
+    
+    return resolve
+
 
 class WebScraper:
-    def __init__(self, use_playwright: bool = False):
+    def __init__(self, use_playwright: bool = False, max_browser_contexts: int = 4,
+                 limit_per_host: int = MAX_CONCURRENCY_PER_HOST):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
         })
+        # Pooled client for every static fetch, created on first use (see _get_client)
+        self._client: Optional[httpx.AsyncClient] = None
         self.use_playwright = use_playwright
-        self.playwright_browser = None
+        # Shared Chromium instance, launched on the first JS scrape and reused until aclose()
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        # Each concurrent JS scrape holds one browser context - bound them to cap memory
+        self._context_slots = asyncio.Semaphore(max_browser_contexts)
+        self.limit_per_host = limit_per_host
+        # host -> [semaphore, users]; an entry is dropped once nobody holds or waits on it
+        self._host_slots: Dict[str, list] = {}
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str):
+        """Hold one of the limit_per_host slots for the URL's host"""
+        host = urlparse(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = [asyncio.Semaphore(self.limit_per_host), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                del self._host_slots[host]
 
     async def scrape(self, url: str, use_javascript: bool = False) -> Dict[str, Any]:
         """
@@ -34,53 +178,73 @@ class WebScraper:
         Returns:
             Dictionary containing structured data from the page
         """
-        try:
-            # Try to fetch with requests first (faster)
-            if not use_javascript:
-                return await self._scrape_static(url)
-            else:
-                return await self._scrape_with_playwright(url)
-                
-        except Exception as e:
-            # If static scraping fails and we haven't tried JS, try with Playwright
-            if not use_javascript:
-                try:
+        async with self._host_slot(url):
+            try:
+                # Try to fetch with requests first (faster)
+                if not use_javascript:
+                    return await self._scrape_static(url)
+                else:
                     return await self._scrape_with_playwright(url)
-                except:
-                    pass
-            raise Exception(f"Scraping failed: {str(e)}")
+
+            except Exception as e:
+                # If static scraping fails and we haven't tried JS, try with Playwright
+                # (pointless for PDFs, images etc. - a browser won't turn them into HTML)
+                if not use_javascript and not isinstance(e, UnsupportedContentError):
+                    try:
+                        return await self._scrape_with_playwright(url)
+                    except:
+                        pass
+                raise Exception(f"Scraping failed: {str(e)}")
 
     async def _scrape_static(self, url: str) -> Dict[str, Any]:
         """Scrape static HTML content - extracts data from raw HTML including embedded JSON"""
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.get(url, headers=self.session.headers)
+        async with self._get_client().stream("GET", url) as response:
             response.raise_for_status()
-            
-            html_content = response.text
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # FIRST: Extract embedded JSON data BEFORE removing scripts
-            embedded_data = self._extract_embedded_json(soup, url)
-            
-            # Remove script and style elements for text extraction
-            for script in soup(["script", "style", "noscript"]):
-                script.decompose()
-            
-            # Extract structured data from HTML
-            data = await self._extract_structured_data(soup, url, html_content)
-            
-            # Merge embedded JSON data
-            if embedded_data:
-                data['embedded_data'] = embedded_data
-                # If we found restaurants/businesses, add them prominently
-                if 'restaurants' in embedded_data:
-                    data['restaurants'] = embedded_data['restaurants']
-                if 'businesses' in embedded_data:
-                    data['businesses'] = embedded_data['businesses']
-                if 'items' in embedded_data:
-                    data['items'] = embedded_data['items']
-            
-            return data
+
+            # Don't download PDFs, images, archives etc. - there is no HTML to parse
+            content_type = response.headers.get('content-type', '').lower()
+            if content_type and 'html' not in content_type and 'xml' not in content_type:
+                raise UnsupportedContentError(f"Unsupported content type: {content_type}")
+
+            # Read the body incrementally and stop at the cap - the first
+            # MAX_RESPONSE_BYTES of an oversized page still parse fine
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes(65536):
+                buffer.extend(chunk)
+                if len(buffer) >= MAX_RESPONSE_BYTES:
+                    del buffer[MAX_RESPONSE_BYTES:]
+                    logger.warning(f"Response from {url} truncated at {MAX_RESPONSE_BYTES} bytes")
+                    break
+
+            content = bytes(buffer)
+            html_content = content.decode(response.encoding or 'utf-8', errors='replace')
+
+        # Parsing and extraction are CPU-bound - run them in a thread so the event loop
+        # keeps serving other in-flight requests on large pages
+        return await asyncio.to_thread(self._parse_static_page, content, url, html_content)
+
+    def _parse_static_page(self, content: bytes, url: str, html_content: str) -> Dict[str, Any]:
+        """Parse a downloaded HTML page into structured data (blocking - call via a thread)"""
+        soup = BeautifulSoup(content, HTML_PARSER)
+        
+        # FIRST: Extract embedded JSON data BEFORE scripts are removed
+        embedded_data = self._extract_embedded_json(soup, url)
+        
+        # Extract structured data from HTML (drops script/style/noscript as it goes)
+        data = self._extract_structured_data(soup, url, html_content)
+        
+        # Merge embedded JSON data
+        if embedded_data:
+            data['embedded_data'] = embedded_data
+            # If we found restaurants/businesses, add them prominently
+            if 'restaurants' in embedded_data:
+                data['restaurants'] = embedded_data['restaurants']
+            if 'businesses' in embedded_data:
+                data['businesses'] = embedded_data['businesses']
+            if 'items' in embedded_data:
+                data['items'] = embedded_data['items']
+        
+        return data
     
     def _extract_embedded_json(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
         """Extract JSON data embedded in script tags - many sites include data this way"""
@@ -90,7 +254,9 @@ class WebScraper:
         json_ld_data = []
         for script in soup.find_all('script', type='application/ld+json'):
             try:
-                data = json.loads(script.string)
+                data = _loads_script_json(script)
+                if data is None:
+                    continue
                 json_ld_data.append(data)
                 
                 # Extract restaurants/businesses from JSON-LD
@@ -124,10 +290,11 @@ class WebScraper:
         next_data_script = soup.find('script', id='__NEXT_DATA__')
         if next_data_script:
             try:
-                next_data = json.loads(next_data_script.string)
-                embedded['next_data'] = next_data
-                # Try to find business data in Next.js payload
-                self._extract_from_nested(next_data, embedded)
+                next_data = _loads_script_json(next_data_script)
+                if next_data is not None:
+                    embedded['next_data'] = next_data
+                    # Try to find business data in Next.js payload
+                    self._extract_from_nested(next_data, embedded)
             except (json.JSONDecodeError, AttributeError):
                 pass
         
@@ -418,26 +585,59 @@ class WebScraper:
             'special_hours': biz.get('special_hours'),
         }
 
-    async def _scrape_with_playwright(self, url: str) -> Dict[str, Any]:
-        """Scrape JavaScript-rendered content using Playwright with anti-detection"""
-        try:
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use so parse-only scrapers allocate no pool"""
+        if self._client is None:
+            # One pooled client for every static fetch, so repeat hosts reuse warm connections.
+            # HTTP/2 forbids connection-specific headers, so Connection is left to httpx.
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=30.0,
+                follow_redirects=True,
+                headers={k: v for k, v in self.session.headers.items() if k.lower() != 'connection'},
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            )
+        return self._client
+
+    async def _get_browser(self):
+        """Return the shared Chromium browser, launching it on first use"""
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            
             from playwright.async_api import async_playwright
+            
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            
+            # Launch with anti-detection settings
+            self._browser = await self._playwright.chromium.launch(
+                headless=True,
+                args=[
+                    '--disable-blink-features=AutomationControlled',
+                    '--disable-dev-shm-usage',
+                    '--no-sandbox',
+                    '--disable-setuid-sandbox',
+                    '--disable-web-security',
+                    '--disable-features=IsolateOrigins,site-per-process',
+                ]
+            )
+            return self._browser
+
+    async def _scrape_with_playwright(
+        self, url: str, extract_kind: Literal['full', 'minimal'] = 'full'
+    ) -> Dict[str, Any]:
+        """
+        Scrape JavaScript-rendered content using Playwright with anti-detection.
+        Pass extract_kind='minimal' when only text, title, h2/h3 headings and JSON-LD are needed.
+        """
+        try:
             import random
             
-            async with async_playwright() as p:
-                # Launch with anti-detection settings
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-dev-shm-usage',
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-web-security',
-                        '--disable-features=IsolateOrigins,site-per-process',
-                    ]
-                )
-                
+            browser = await self._get_browser()
+            
+            # Borrow a fresh context from the shared browser; cookies and storage stay per-scrape
+            async with self._context_slots:
                 # Create context with realistic browser fingerprint
                 context = await browser.new_context(
                     viewport={'width': 1920, 'height': 1080},
@@ -449,133 +649,71 @@ class WebScraper:
                     java_script_enabled=True,
                 )
                 
-                page = await context.new_page()
+                try:
+                    # Image/media/font bytes are never used - only their URLs, which are in the DOM anyway
+                    await context.route("**/*", _block_heavy_resources)
+                    page = await context.new_page()
                 
-                # Add stealth scripts to avoid detection
-                await page.add_init_script("""
-                    // Override webdriver property
-                    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+                    # Add stealth scripts to avoid detection
+                    await page.add_init_script("""
+                        // Override webdriver property
+                        Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
                     
-                    // Override plugins
-                    Object.defineProperty(navigator, 'plugins', {
-                        get: () => [1, 2, 3, 4, 5]
-                    });
+                        // Override plugins
+                        Object.defineProperty(navigator, 'plugins', {
+                            get: () => [1, 2, 3, 4, 5]
+                        });
                     
-                    // Override languages
-                    Object.defineProperty(navigator, 'languages', {
-                        get: () => ['en-US', 'en']
-                    });
+                        // Override languages
+                        Object.defineProperty(navigator, 'languages', {
+                            get: () => ['en-US', 'en']
+                        });
                     
-                    // Override chrome
-                    window.chrome = { runtime: {} };
+                        // Override chrome
+                        window.chrome = { runtime: {} };
                     
-                    // Override permissions
-                    const originalQuery = window.navigator.permissions.query;
-                    window.navigator.permissions.query = (parameters) => (
-                        parameters.name === 'notifications' ?
-                            Promise.resolve({ state: Notification.permission }) :
-                            originalQuery(parameters)
-                    );
-                """)
-                
-                # Navigate with realistic behavior
-                try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=45000)
-                except Exception as e:
-                    logger.warning(f"Initial page load issue: {e}, continuing...")
-                
-                # Random delay to mimic human behavior
-                await page.wait_for_timeout(random.randint(2000, 4000))
-                
-                # Scroll down to trigger lazy loading
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-                await page.wait_for_timeout(random.randint(1000, 2000))
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(random.randint(1500, 3000))
-                
-                # Scroll back up
-                await page.evaluate("window.scrollTo(0, 0)")
-                await page.wait_for_timeout(1000)
-                
-                # Get page content
-                html_content = await page.content()
-                title = await page.title()
-                
-                # Extract text content
-                text_content = await page.evaluate("""
-                    () => {
-                        // Remove script and style elements
-                        const scripts = document.querySelectorAll('script, style, noscript');
-                        scripts.forEach(el => el.remove());
-                        
-                        // Get main content
-                        const body = document.body;
-                        return body.innerText || body.textContent || '';
-                    }
-                """)
-                
-                # Extract links
-                links = await page.evaluate("""
-                    () => {
-                        const links = Array.from(document.querySelectorAll('a[href]'));
-                        return links.map(a => ({
-                            text: a.innerText.trim(),
-                            href: a.href,
-                            title: a.title || ''
-                        })).slice(0, 100);
-                    }
-                """)
-                
-                # Extract images
-                images = await page.evaluate("""
-                    () => {
-                        const imgs = Array.from(document.querySelectorAll('img[src]'));
-                        return imgs.map(img => ({
-                            src: img.src,
-                            alt: img.alt || '',
-                            title: img.title || ''
-                        })).slice(0, 50);
-                    }
-                """)
-                
-                # Extract meta tags
-                meta_data = await page.evaluate("""
-                    () => {
-                        const metas = {};
-                        document.querySelectorAll('meta').forEach(meta => {
-                            const name = meta.getAttribute('name') || meta.getAttribute('property');
-                            const content = meta.getAttribute('content');
-                            if (name && content) {
-                                metas[name] = content;
-                            }
-                        });
-                        return metas;
-                    }
-                """)
+                        // Override permissions
+                        const originalQuery = window.navigator.permissions.query;
+                        window.navigator.permissions.query = (parameters) => (
+                            parameters.name === 'notifications' ?
+                                Promise.resolve({ state: Notification.permission }) :
+                                originalQuery(parameters)
+                        );
+                    """)
                 
-                # Close properly
-                await context.close()
-                await browser.close()
+                    # Navigate with realistic behavior
+                    try:
+                        await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+                    except Exception as e:
+                        logger.warning(f"Initial page load issue: {e}, continuing...")
                 
-                # Check if we got meaningful content
-                if len(text_content.strip()) < 100:
-                    logger.warning(f"Low content detected ({len(text_content)} chars), page may be blocked")
+                    # Random delay to mimic human behavior
+                    await page.wait_for_timeout(random.randint(2000, 4000))
                 
-                # Parse with BeautifulSoup for additional extraction
-                soup = BeautifulSoup(html_content, 'html.parser')
-                structured_data = await self._extract_structured_data(soup, url, html_content)
+                    # Scroll down to trigger lazy loading
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
+                    await page.wait_for_timeout(random.randint(1000, 2000))
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await page.wait_for_timeout(random.randint(1500, 3000))
                 
-                # Merge Playwright data
-                structured_data.update({
-                    'title': title,
-                    'text_content': text_content[:10000],  # Limit text
-                    'links': links,
-                    'images': images,
-                    'meta_tags': meta_data,
-                    'rendered_with_javascript': True
-                })
+                    # Scroll back up
+                    await page.evaluate("window.scrollTo(0, 0)")
+                    await page.wait_for_timeout(1000)
                 
-                return structured_data
+                    html_content = await page.content()
+                finally:
+                    await context.close()
+            
+            # Same extraction as static pages, run off the event loop
+            structured_data = await asyncio.to_thread(self._parse_rendered_page, html_content, url, extract_kind)
+            structured_data['rendered_with_javascript'] = True
+            
+            # Check if we got meaningful content
+            text_content = structured_data['text_content'] or ''
+            if len(text_content.strip()) < 100:
+                logger.warning(f"Low content detected ({len(text_content)} chars), page may be blocked")
+            
+            return structured_data
                 
         except ImportError:
             raise Exception("Playwright not available. Install with: pip install playwright && playwright install chromium")
@@ -768,7 +906,7 @@ class WebScraper:
                 
                 # Extract from rendered HTML
                 html_content = await page.content()
-                soup = BeautifulSoup(html_content, 'html.parser')
+                soup = BeautifulSoup(html_content, HTML_PARSER)
                 embedded_data = self._extract_embedded_json(soup, url)
                 
                 if embedded_data:
@@ -802,89 +940,190 @@ class WebScraper:
             logger.error(f"Internal data extraction failed: {str(e)}")
             raise Exception(f"Internal data extraction failed: {str(e)}")
 
-    async def _extract_structured_data(self, soup: BeautifulSoup, url: str, html_content: str) -> Dict[str, Any]:
+    def _parse_rendered_page(
+        self, html_content: str, url: str, extract_kind: Literal['full', 'minimal'] = 'full'
+    ) -> Dict[str, Any]:
+        """Parse browser-rendered HTML into structured data (blocking - call via a thread)"""
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        return self._extract_structured_data(soup, url, html_content, extract_kind)
+
+    def _extract_structured_data(
+        self,
+        soup: BeautifulSoup,
+        url: str,
+        html_content: str,
+        extract_kind: Literal['full', 'minimal'] = 'full'
+    ) -> Dict[str, Any]:
         """Extract structured data from parsed HTML"""
+        if extract_kind == 'minimal':
+            return self._extract_minimal_data(soup, url)
+        
         base_url = url
         
+        resolve_url = _url_resolver(base_url)
+        
+        # Walk the tree once, bucketing the elements each section below needs.
+        # script/style/noscript subtrees are skipped and removed after the walk.
+        title_tag = None
+        first_h1 = None
+        body = None
+        main_candidates = [None] * 6  # article, main, [role=main], .content, #content, .main-content
+        links = {'texts': [], 'hrefs': [], 'titles': []}
+        link_hrefs = links['hrefs']
+        seen_links = set()
+        images = {'srcs': [], 'alts': [], 'titles': []}
+        image_srcs = images['srcs']
+        seen_images = set()
+        meta_tags = {}
+        heading_tags = {f'h{level}': [] for level in range(1, 7)}
+        list_tags = []
+        table_tags = []
+        code_tags = []
+        json_ld_scripts = []
+        skipped = []
+        # Page-type evidence (see _page_type_from_signals); 'article' comes from main_candidates
+        page_signals = {'itemtype': None, 'product_class': False, 'time': False, 'post_class': False, 'form': False}
+        
+        stack = [soup]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, Tag):
+                continue
+            name = node.name
+            attrs = node.attrs
+            
+            if name in SKIPPED_TAGS:
+                skipped.append(node)
+                if name == 'script' and attrs.get('type') == 'application/ld+json':
+                    json_ld_scripts.append(node)
+                continue
+            
+            if name == 'a':
+                if len(link_hrefs) < 100:
+                    href = attrs.get('href')
+                    if href:
+                        # Resolve relative URLs; deduplicate so repeated nav links don't eat the budget
+                        full_url = resolve_url(href)
+                        if full_url not in seen_links:
+                            seen_links.add(full_url)
+                            links['texts'].append(node.get_text(strip=True))
+                            link_hrefs.append(full_url)
+                            links['titles'].append(attrs.get('title', ''))
+            elif name == 'img':
+                if len(image_srcs) < 50:
+                    src = attrs.get('src')
+                    if src:
+                        full_url = resolve_url(src)
+                        if full_url not in seen_images:
+                            seen_images.add(full_url)
+                            image_srcs.append(full_url)
+                            images['alts'].append(attrs.get('alt', ''))
+                            images['titles'].append(attrs.get('title', ''))
+            elif name == 'meta':
+                content = attrs.get('content')
+                if content:
+                    meta_name = attrs.get('name') or attrs.get('property') or attrs.get('itemprop')
+                    if meta_name:
+                        meta_tags[meta_name] = content
+            elif name in heading_tags:
+                if name == 'h1' and first_h1 is None:
+                    first_h1 = node
+                bucket = heading_tags[name]
+                if len(bucket) < 20:
+                    bucket.append(node)
+            elif name == 'ul' or name == 'ol':
+                if len(list_tags) < 10:
+                    list_tags.append(node)
+            elif name == 'table':
+                if len(table_tags) < 5:
+                    table_tags.append(node)
+            elif name == 'code' or name == 'pre':
+                if len(code_tags) < 10:
+                    code_tags.append(node)
+            elif name == 'title':
+                if title_tag is None:
+                    title_tag = node
+            elif name == 'body':
+                if body is None:
+                    body = node
+            elif name == 'time':
+                page_signals['time'] = True
+            elif name == 'form':
+                page_signals['form'] = True
+            
+            # Main content candidates, first match per kind
+            if name == 'article' and main_candidates[0] is None:
+                main_candidates[0] = node
+            elif name == 'main' and main_candidates[1] is None:
+                main_candidates[1] = node
+            if attrs:
+                if main_candidates[2] is None and attrs.get('role') == 'main':
+                    main_candidates[2] = node
+                classes = attrs.get('class')
+                if classes:
+                    if main_candidates[3] is None and 'content' in classes:
+                        main_candidates[3] = node
+                    if main_candidates[5] is None and 'main-content' in classes:
+                        main_candidates[5] = node
+                    if not (page_signals['product_class'] and page_signals['post_class']):
+                        class_text = ' '.join(classes)
+                        if not page_signals['product_class'] and _PRODUCT_RE.search(class_text):
+                            page_signals['product_class'] = True
+                        if not page_signals['post_class'] and _POSTENTRY_RE.search(class_text):
+                            page_signals['post_class'] = True
+                if main_candidates[4] is None and attrs.get('id') == 'content':
+                    main_candidates[4] = node
+                if page_signals['itemtype'] is None and 'itemtype' in attrs:
+                    page_signals['itemtype'] = attrs['itemtype']
+            
+            stack.extend(reversed(node.contents))
+        
+        # Extract structured data (JSON-LD, microdata) before the scripts are dropped
+        structured_data = self._extract_json_ld([script.string for script in json_ld_scripts])
+        
+        for node in skipped:
+            node.decompose()
+        
         # Extract title
         title = None
-        if soup.title:
-            title = soup.title.string.strip() if soup.title.string else None
-        if not title:
-            h1 = soup.find('h1')
-            if h1:
-                title = h1.get_text(strip=True)
+        if title_tag:
+            title = title_tag.string.strip() if title_tag.string else None
+        if not title and first_h1:
+            title = first_h1.get_text(strip=True)
         
-        # Extract main content (try to find article, main, or content areas)
+        # Extract main content (article, main, or content areas, in that priority)
         main_content = None
-        for selector in ['article', 'main', '[role="main"]', '.content', '#content', '.main-content']:
-            element = soup.select_one(selector)
+        for element in main_candidates:
             if element:
                 main_content = element.get_text(strip=True, separator=' ')
                 break
         
-        if not main_content:
+        if not main_content and body:
             # Fallback to body text
-            body = soup.find('body')
-            if body:
-                main_content = body.get_text(strip=True, separator=' ')
+            main_content = body.get_text(strip=True, separator=' ')
         
         # Extract all text (cleaned)
         all_text = soup.get_text(strip=True, separator=' ')
         
-        # Extract links with context
-        links = []
-        for a in soup.find_all('a', href=True)[:100]:
-            href = a.get('href')
-            if href:
-                # Resolve relative URLs
-                full_url = urljoin(base_url, href)
-                link_text = a.get_text(strip=True)
-                links.append({
-                    'text': link_text,
-                    'href': full_url,
-                    'title': a.get('title', '')
-                })
-        
-        # Extract images with context
-        images = []
-        for img in soup.find_all('img', src=True)[:50]:
-            src = img.get('src')
-            if src:
-                full_url = urljoin(base_url, src)
-                images.append({
-                    'src': full_url,
-                    'alt': img.get('alt', ''),
-                    'title': img.get('title', '')
-                })
-        
-        # Extract meta tags
-        meta_tags = {}
-        for meta in soup.find_all('meta'):
-            name = meta.get('name') or meta.get('property') or meta.get('itemprop')
-            content = meta.get('content')
-            if name and content:
-                meta_tags[name] = content
-        
         # Extract headings
-        headings = {}
-        for level in range(1, 7):
-            tag = f'h{level}'
-            headings[tag] = [h.get_text(strip=True) for h in soup.find_all(tag)][:20]
+        headings = {
+            level: [h.get_text(strip=True) for h in tags]
+            for level, tags in heading_tags.items()
+        }
         
         # Extract data organized by sections (NEW: categorize by section titles)
         sections_data = self._extract_sections(soup)
         
         # Extract lists
         lists = []
-        for ul in soup.find_all(['ul', 'ol'])[:10]:
+        for ul in list_tags:
             items = [li.get_text(strip=True) for li in ul.find_all('li')]
             if items:
                 lists.append(items)
         
         # Extract tables
         tables = []
-        for table in soup.find_all('table')[:5]:
+        for table in table_tags:
             rows = []
             for tr in table.find_all('tr'):
                 cells = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
@@ -895,18 +1134,17 @@ class WebScraper:
         
         # Extract code blocks
         code_blocks = []
-        for code in soup.find_all(['code', 'pre'])[:10]:
+        for code in code_tags:
             code_text = code.get_text(strip=True)
             if code_text and len(code_text) > 10:
                 code_blocks.append(code_text[:500])  # Limit length
         
         # Detect page type
-        page_type = self._detect_page_type(soup, meta_tags)
-        
-        # Extract structured data (JSON-LD, microdata)
-        structured_data = self._extract_json_ld(soup)
+        page_signals['article'] = main_candidates[0] is not None
+        page_type = self._page_type_from_signals(meta_tags, page_signals)
         
         return {
+            'schema_version': RESULT_SCHEMA_VERSION,
             'url': url,
             'title': title,
             'text_content': all_text[:10000],  # Limit to 10k chars
@@ -925,6 +1163,38 @@ class WebScraper:
             'rendered_with_javascript': False
         }
 
+    def _extract_minimal_data(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+        """Extract only the title, text, h2/h3 headings and JSON-LD (see _extract_structured_data)"""
+        structured_data = self._extract_json_ld([
+            script.string for script in soup.find_all('script', type='application/ld+json')
+        ])
+        
+        for node in soup.find_all(list(SKIPPED_TAGS)):
+            node.decompose()
+        
+        title = None
+        if soup.title and soup.title.string:
+            title = soup.title.string.strip()
+        if not title:
+            first_h1 = soup.find('h1')
+            if first_h1:
+                title = first_h1.get_text(strip=True)
+        
+        headings = {
+            level: [h.get_text(strip=True) for h in soup.find_all(level, limit=20)]
+            for level in ('h2', 'h3')
+        }
+        
+        return {
+            'schema_version': RESULT_SCHEMA_VERSION,
+            'url': url,
+            'title': title,
+            'text_content': soup.get_text(strip=True, separator=' ')[:10000],  # Limit to 10k chars
+            'headings': headings,
+            'structured_data': structured_data,
+            'rendered_with_javascript': False
+        }
+
     def _extract_sections(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """
         Extract data organized by section titles.
@@ -933,24 +1203,19 @@ class WebScraper:
         Returns:
             Dictionary where keys are section titles and values contain section content
         """
-        sections = {}
-        
-        # Find all section headings (h2, h3, h4 are most common for sections)
+        # Find all section headings (h2, h3, h4 are most common for sections), in document order
         section_headings = []
-        for tag in ['h2', 'h3', 'h4']:
-            for heading in soup.find_all(tag):
-                heading_text = heading.get_text(strip=True)
-                if heading_text and len(heading_text) < 200:  # Reasonable section title length
-                    section_headings.append({
-                        'tag': tag,
-                        'text': heading_text,
-                        'element': heading
-                    })
-        
-        # Sort headings by their position in the document
-        section_headings.sort(key=lambda x: x['element'].sourceline if hasattr(x['element'], 'sourceline') else 0)
+        for heading in soup.find_all(['h2', 'h3', 'h4']):
+            heading_text = heading.get_text(strip=True)
+            if heading_text and len(heading_text) < 200:  # Reasonable section title length
+                section_headings.append({
+                    'tag': heading.name,
+                    'text': heading_text,
+                    'element': heading
+                })
         
         # Extract content for each section
+        section_items = []
         for i, heading_info in enumerate(section_headings):
             heading = heading_info['element']
             section_title = heading_info['text']
@@ -1020,6 +1285,14 @@ class WebScraper:
                 except:
                     break
             
+            section_items.append((section_title, section_content))
+        
+        return self._build_sections(section_items)
+    
+    def _build_sections(self, section_items: List[Any]) -> Dict[str, Any]:
+        """Group (section title, content items) pairs into the sections mapping"""
+        sections = {}
+        for section_title, section_content in section_items:
             # If we have content for this section, add it
             if section_content:
                 # Clean up section title (remove extra whitespace, normalize)
@@ -1054,45 +1327,41 @@ class WebScraper:
         
         return sections
     
-    def _detect_page_type(self, soup: BeautifulSoup, meta_tags: Dict[str, str]) -> str:
-        """Detect the type of page (article, product, blog, etc.)"""
-        # Check Open Graph type
+    def _page_type_from_signals(self, meta_tags: Dict[str, str], signals: Dict[str, Any]) -> str:
+        """Classify the page type from signals gathered while walking the DOM"""
         og_type = meta_tags.get('og:type', '').lower()
         if og_type:
             return og_type
         
-        # Check schema.org type
-        schema_type = soup.find(attrs={'itemtype': True})
-        if schema_type:
-            itemtype = schema_type.get('itemtype', '')
-            if 'Article' in itemtype:
-                return 'article'
-            elif 'Product' in itemtype:
-                return 'product'
-            elif 'Person' in itemtype:
-                return 'profile'
-        
-        # Heuristic detection
-        if soup.find('article'):
+        itemtype = signals.get('itemtype') or ''
+        if 'Article' in itemtype:
+            return 'article'
+        elif 'Product' in itemtype:
+            return 'product'
+        elif 'Person' in itemtype:
+            return 'profile'
+        
+        if signals.get('article'):
             return 'article'
-        elif soup.find(attrs={'class': re.compile(r'product|item', re.I)}):
+        elif signals.get('product_class'):
             return 'product'
-        elif soup.find('time') or soup.find(attrs={'class': re.compile(r'post|entry', re.I)}):
+        elif signals.get('time') or signals.get('post_class'):
             return 'blog'
-        elif soup.find('form'):
+        elif signals.get('form'):
             return 'form'
         
         return 'generic'
 
-    def _extract_json_ld(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Extract JSON-LD structured data"""
+    def _extract_json_ld(self, blobs: List[Optional[str]]) -> List[Dict[str, Any]]:
+        """Decode JSON-LD structured data from the raw bodies of application/ld+json scripts"""
         structured_data = []
-        for script in soup.find_all('script', type='application/ld+json'):
+        for raw in blobs:
             try:
-                data = json.loads(script.string)
-                structured_data.append(data)
-            except (json.JSONDecodeError, AttributeError):
+                data = _loads_json_text(raw)
+            except json.JSONDecodeError:
                 continue
+            if data is not None:
+                structured_data.append(data)
         return structured_data
 
     async def scrape_opentable(self, location: str, cuisine: str = None, max_results: int = 20) -> Dict[str, Any]:
@@ -1107,11 +1376,12 @@ class WebScraper:
         encoded_location = quote_plus(location)
         encoded_term = quote_plus(search_term)
         
-        url = f"https://www.opentable.com/s?dateTime=2024-12-15T19:00&covers=2&term={encoded_term}&queryUnderstandingType=location&locationString={encoded_location}"
+        url = OPENTABLE_SEARCH_URL.format(term=encoded_term, location=encoded_location)
         
         try:
-            # OpenTable requires JavaScript rendering
-            page_data = await self._scrape_with_playwright(url)
+            # OpenTable requires JavaScript rendering; _parse_opentable_data only needs
+            # the JSON-LD and h2/h3 headings, so skip the rest of the extraction
+            page_data = await self._scrape_with_playwright(url, extract_kind='minimal')
             
             # Try to extract restaurant-specific data
             restaurants = self._parse_opentable_data(page_data)
@@ -1235,15 +1505,14 @@ class WebScraper:
         if not html_content:
             # Fallback: use httpx
             try:
-                async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                    response = await client.get(listing_url, headers=self.session.headers)
-                    response.raise_for_status()
-                    html_content = response.text
+                response = await self._get_client().get(listing_url)
+                response.raise_for_status()
+                html_content = response.text
             except Exception as e:
                 logger.error(f"Failed to get HTML: {e}")
                 return []
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Extract embedded JSON first (most reliable)
         embedded_data = self._extract_embedded_json(soup, listing_url)
@@ -1267,14 +1536,9 @@ class WebScraper:
                     seen_urls.add(url)
         
         # Method 2: Extract from links (common pattern)
-        links = listing_data.get('links', [])
-        for link in links:
-            if isinstance(link, dict):
-                href = link.get('href', '')
-                text = link.get('text', '').lower()
-            else:
-                href = str(link)
-                text = ''
+        links = listing_data.get('links') or {}
+        for text, href in zip(links.get('texts', []), links.get('hrefs', [])):
+            text = text.lower()
             
             if not href:
                 continue
@@ -1383,8 +1647,6 @@ class WebScraper:
         Returns:
             List of restaurants with merged data from listing + individual pages
         """
-        import asyncio
-        
         if not restaurants:
             return []
         
@@ -1433,10 +1695,9 @@ class WebScraper:
                 # Fallback: get HTML with httpx
                 if not html_content:
                     try:
-                        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                            response = await client.get(url, headers=self.session.headers)
-                            response.raise_for_status()
-                            html_content = response.text
+                        response = await self._get_client().get(url)
+                        response.raise_for_status()
+                        html_content = response.text
                     except Exception as e:
                         logger.warning(f"Failed to get HTML with httpx: {e}")
                 
@@ -1448,7 +1709,7 @@ class WebScraper:
                 page_data = await self.scrape(url, use_javascript=use_javascript)
                 
                 # Parse HTML for embedded data
-                soup = BeautifulSoup(html_content, 'html.parser')
+                soup = BeautifulSoup(html_content, HTML_PARSER)
                 
                 embedded_data = self._extract_embedded_json(soup, url)
                 
@@ -1468,7 +1729,7 @@ class WebScraper:
                     detailed_restaurant['page_title'] = page_data['title']
                 
                 # Extract structured data from HTML
-                structured_data = await self._extract_structured_data(soup, url, str(page_data))
+                structured_data = self._extract_structured_data(soup, url, str(page_data))
                 
                 # Merge address data (individual pages have full addresses)
                 if structured_data.get('text_content'):
@@ -1492,25 +1753,26 @@ class WebScraper:
                 
                 # Extract menu URLs from links
                 menu_urls = {}
-                for link in structured_data.get('links', []):
-                    href = link.get('href', '').lower()
-                    text = link.get('text', '').lower()
+                links = structured_data.get('links') or {}
+                for link_text, link_href in zip(links.get('texts', []), links.get('hrefs', [])):
+                    href = link_href.lower()
+                    text = link_text.lower()
                     
                     if 'menu' in href or 'menu' in text:
                         if 'lunch' in href or 'lunch' in text:
-                            menu_urls['lunch_menu'] = link.get('href')
+                            menu_urls['lunch_menu'] = link_href
                         elif 'dinner' in href or 'dinner' in text:
-                            menu_urls['dinner_menu'] = link.get('href')
+                            menu_urls['dinner_menu'] = link_href
                         elif 'brunch' in href or 'brunch' in text:
-                            menu_urls['brunch_menu'] = link.get('href')
+                            menu_urls['brunch_menu'] = link_href
                         elif 'drink' in href or 'drink' in text or 'bar' in href:
-                            menu_urls['drinks_menu'] = link.get('href')
+                            menu_urls['drinks_menu'] = link_href
                         elif 'dessert' in href or 'dessert' in text:
-                            menu_urls['dessert_menu'] = link.get('href')
+                            menu_urls['dessert_menu'] = link_href
                         elif 'order' in href or 'order' in text or 'delivery' in href:
-                            menu_urls['online_ordering'] = link.get('href')
+                            menu_urls['online_ordering'] = link_href
                         else:
-                            menu_urls['main_menu'] = menu_urls.get('main_menu') or link.get('href')
+                            menu_urls['main_menu'] = menu_urls.get('main_menu') or link_href
                 
                 if menu_urls:
                     detailed_restaurant['menu_urls'] = menu_urls
@@ -1583,8 +1845,16 @@ class WebScraper:
         logger.info(f"Completed detailed extraction for {len(detailed_restaurants)} restaurants")
         return detailed_restaurants
 
-    def close(self):
+    async def aclose(self):
+        """Release the HTTP clients and shut down the shared browser, if one was started"""
         self.session.close()
-        if self.playwright_browser:
-            # Playwright cleanup would go here if we maintain a persistent browser
-            pass
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        async with self._browser_lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
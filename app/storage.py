@@ -1,6 +1,7 @@
 from supabase import create_client, Client
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import asyncio
 import os
 import logging
 from dotenv import load_dotenv
@@ -9,8 +10,61 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Rows per scrape_results insert
+RESULTS_CHUNK_SIZE = 200
+
+# Rows read per request when paging through results (PostgREST caps a response at max-rows, 1000 by default)
+RESULTS_PAGE_SIZE = 1000
+
+
+def _normalize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in defaults for optional job fields and make timestamps strings, in place"""
+    # Ensure all optional fields have defaults
+    defaults = {
+        'url': None,
+        'filters': None,
+        'ai_prompt': None,
+        'export_format': 'json',
+        'crawl_mode': False,
+        'search_query': None,
+        'max_pages': None,
+        'max_depth': None,
+        'same_domain': None,
+        'use_javascript': False,
+        'extract_individual_pages': True,  # Default: enabled for restaurant pages
+        'error': None,
+        'completed_at': None
+    }
+
+    for key, default_value in defaults.items():
+        if key not in job:
+            job[key] = default_value
+
+    # Keep datetime as-is (let main.py handle conversion)
+    # Just ensure they're strings if they exist
+    if 'created_at' in job and job['created_at']:
+        if not isinstance(job['created_at'], str):
+            if hasattr(job['created_at'], 'isoformat'):
+                job['created_at'] = job['created_at'].isoformat()
+            else:
+                job['created_at'] = str(job['created_at'])
+
+    if 'completed_at' in job and job.get('completed_at'):
+        if not isinstance(job['completed_at'], str):
+            if hasattr(job['completed_at'], 'isoformat'):
+                job['completed_at'] = job['completed_at'].isoformat()
+            else:
+                job['completed_at'] = str(job['completed_at'])
+    return job
+
 
 class Storage:
+    """
+    Supabase-backed job and result store.
+    supabase-py is synchronous, so every request's execute() runs in a worker thread
+    to keep the event loop free while it waits on the network.
+    """
+    
     def __init__(self):
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_ANON_KEY")
@@ -52,10 +106,14 @@ class Storage:
             else:
                 raise
 
+        # Cleared if the finish_job / clone_results functions are missing from the database
+        self._finish_job_rpc = True
+        self._clone_results_rpc = True
+
     async def create_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new scraping job"""
         try:
-            response = self.client.table('scrape_jobs').insert(job_data).execute()
+            response = await asyncio.to_thread(self.client.table('scrape_jobs').insert(job_data).execute)
             return response.data[0] if response.data else None
         except Exception as e:
             # Extract error message from Supabase exception
@@ -85,7 +143,9 @@ class Storage:
             logger.debug(f"Fetching job {job_id} from database")
             
             # Try to fetch the job
-            response = self.client.table('scrape_jobs').select('*').eq('id', job_id).limit(1).execute()
+            response = await asyncio.to_thread(
+                self.client.table('scrape_jobs').select('*').eq('id', job_id).limit(1).execute
+            )
             
             # Get first result or None
             if response.data and len(response.data) > 0:
@@ -100,42 +160,7 @@ class Storage:
             
             logger.debug(f"Job data keys: {list(job.keys())}")
             
-            # Ensure all optional fields have defaults
-            defaults = {
-                'url': None,
-                'filters': None,
-                'ai_prompt': None,
-                'export_format': 'json',
-                'crawl_mode': False,
-                'search_query': None,
-                'max_pages': None,
-                'max_depth': None,
-                'same_domain': None,
-                'use_javascript': False,
-                'extract_individual_pages': True,  # Default: enabled for restaurant pages
-                'error': None,
-                'completed_at': None
-            }
-            
-            for key, default_value in defaults.items():
-                if key not in job:
-                    job[key] = default_value
-            
-            # Keep datetime as-is (let main.py handle conversion)
-            # Just ensure they're strings if they exist
-            if 'created_at' in job and job['created_at']:
-                if not isinstance(job['created_at'], str):
-                    if hasattr(job['created_at'], 'isoformat'):
-                        job['created_at'] = job['created_at'].isoformat()
-                    else:
-                        job['created_at'] = str(job['created_at'])
-            
-            if 'completed_at' in job and job.get('completed_at'):
-                if not isinstance(job['completed_at'], str):
-                    if hasattr(job['completed_at'], 'isoformat'):
-                        job['completed_at'] = job['completed_at'].isoformat()
-                    else:
-                        job['completed_at'] = str(job['completed_at'])
+            _normalize_job(job)
             
             logger.debug(f"Successfully fetched and normalized job {job_id}")
             return job
@@ -163,15 +188,96 @@ class Storage:
 
     async def update_job(self, job_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a job"""
-        response = self.client.table('scrape_jobs').update(updates).eq('id', job_id).execute()
+        response = await asyncio.to_thread(self.client.table('scrape_jobs').update(updates).eq('id', job_id).execute)
         return response.data[0] if response.data else None
 
+    async def bulk_update_jobs(
+        self,
+        job_ids: List[str],
+        updates: Dict[str, Any],
+        from_status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply the same update to several jobs in one request, optionally only to jobs still in from_status.
+        Returns the updated rows, normalized like get_job().
+        """
+        query = self.client.table('scrape_jobs').update(updates).in_('id', job_ids)
+        if from_status is not None:
+            query = query.eq('status', from_status)
+        response = await asyncio.to_thread(query.execute)
+        return [_normalize_job(row.copy()) for row in response.data or []]
+
     async def save_results(self, job_id: str, results: List[Dict[str, Any]]) -> None:
-        """Save scraping results"""
+        """Save scraping results, inserting large sets in concurrent batches"""
         data = [{'job_id': job_id, 'data': result} for result in results]
-        self.client.table('scrape_results').insert(data).execute()
+        chunks = [data[i:i + RESULTS_CHUNK_SIZE] for i in range(0, len(data), RESULTS_CHUNK_SIZE)]
+        await asyncio.gather(*(asyncio.to_thread(self._insert_results, chunk) for chunk in chunks))
+
+    def _insert_results(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert one batch of result rows (blocking - call via a thread)"""
+        self.client.table('scrape_results').insert(rows).execute()
+
+    async def finish_job(
+        self,
+        job_id: str,
+        results: List[Dict[str, Any]],
+        status: str,
+        completed_at: str
+    ) -> None:
+        """Save results and mark the job finished in one round-trip (finish_job RPC)"""
+        # Large result sets go through batched inserts rather than one giant RPC payload
+        if self._finish_job_rpc and len(results) <= RESULTS_CHUNK_SIZE:
+            try:
+                await asyncio.to_thread(self.client.rpc('finish_job', {
+                    'p_job_id': job_id,
+                    'p_status': status,
+                    'p_completed_at': completed_at,
+                    'p_results': results
+                }).execute)
+                return
+            except Exception as e:
+                # PGRST202: the function hasn't been created in this database yet
+                if getattr(e, 'code', None) != 'PGRST202':
+                    raise
+                logger.warning("finish_job RPC not found - run supabase_setup.sql to create it. Falling back to separate calls")
+                self._finish_job_rpc = False
+        
+        await self.save_results(job_id, results)
+        await self.update_job(job_id, {'status': status, 'completed_at': completed_at})
+
+    async def clone_results(self, source_job_id: str, job_id: str) -> int:
+        """Copy another job's saved results to this job; returns the number of rows copied"""
+        if self._clone_results_rpc:
+            # Server-side INSERT ... SELECT: no rows travel through the worker, no max-rows cap
+            try:
+                response = await asyncio.to_thread(self.client.rpc('clone_results', {
+                    'p_source_job_id': source_job_id,
+                    'p_job_id': job_id
+                }).execute)
+                return response.data or 0
+            except Exception as e:
+                if getattr(e, 'code', None) != 'PGRST202':
+                    raise
+                logger.warning("clone_results RPC not found - run supabase_setup.sql to create it. Falling back to paged copy")
+                self._clone_results_rpc = False
+        
+        # Page through the source in a stable order until a short page comes back
+        copied = 0
+        while True:
+            query = (
+                self.client.table('scrape_results').select('data').eq('job_id', source_job_id)
+                .order('created_at').order('id')
+                .range(copied, copied + RESULTS_PAGE_SIZE - 1)
+            )
+            response = await asyncio.to_thread(query.execute)
+            rows = response.data or []
+            if rows:
+                await self.save_results(job_id, [row['data'] for row in rows])
+                copied += len(rows)
+            if len(rows) < RESULTS_PAGE_SIZE:
+                return copied
 
     async def get_results(self, job_id: str) -> List[Dict[str, Any]]:
         """Get results for a job"""
-        response = self.client.table('scrape_results').select('*').eq('job_id', job_id).execute()
+        response = await asyncio.to_thread(self.client.table('scrape_results').select('*').eq('job_id', job_id).execute)
         return response.data if response.data else []
@@ -1,154 +1,467 @@
 import asyncio
+import hashlib
+import json
 import logging
 import re
-from typing import Dict, Any, List
+import time
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, List, Callable, Optional, Set, Tuple
 from datetime import datetime
-from .scraper import WebScraper
-from .crawler import WebCrawler
+from urllib.parse import urlparse, urlsplit
+from .scraper import WebScraper, MAX_CONCURRENCY_PER_HOST
+from .crawler import WebCrawler, PAGE_TIMEOUT
+from .robots_cache import RobotsCache
 from .ai_filter import AIFilter
 from .storage import Storage
-from .models import JobStatus
+from .models import JobStatus, ScrapeJobInternal
 
 logger = logging.getLogger(__name__)
 
+# Default maximum AI model calls in flight per job
+AI_FILTER_CONCURRENCY = 5
+
+# Default number of jobs run_forever processes at once
+JOB_CONCURRENCY = 8
+
+# AI-filtered rows saved per insert while the filter is still running
+RESULT_BATCH_SIZE = 50
+
+# A whole crawl gets CRAWL_TIMEOUT plus CRAWL_PAGE_BUDGET per requested page before
+# it is stopped; pages scraped by then are kept
+CRAWL_TIMEOUT = 300
+CRAWL_PAGE_BUDGET = 20
+
+# Domains remembered in the learned JS/static scrape-mode cache
+MODE_CACHE_SIZE = 10_000
+
+# Seconds jobs wait to share one RUNNING status update; their rows come back in the same request
+STATUS_FLUSH_INTERVAL = 0.05
+
+# Seconds a learned mode is trusted; after that the browser is tried again
+MODE_CACHE_TTL = 15 * 60
+
+
+# Per-site scrape policy, matched against the URL's host and its parent domains
+SITE_RULES: Dict[str, Dict[str, Any]] = {
+    'opentable.com': {'use_javascript': True},  # OpenTable always needs JS
+}
+
+
+@lru_cache(maxsize=4096)
+def site_flags(host: str) -> Dict[str, Any]:
+    """SITE_RULES entry for a host (e.g. www.opentable.com -> opentable.com), or {} if none applies"""
+    for suffix, flags in SITE_RULES.items():
+        if host == suffix or host.endswith('.' + suffix):
+            return flags
+    return {}
+
+
+# Job fields that determine its results; jobs matching on all of them are scraped once
+JOB_SIGNATURE_FIELDS = (
+    'url', 'search_query', 'crawl_mode', 'max_pages', 'max_depth', 'same_domain',
+    'filters', 'ai_prompt', 'use_javascript', 'extract_individual_pages',
+)
+
+
+def _job_signature(job: ScrapeJobInternal) -> str:
+    """Hash of the fields in JOB_SIGNATURE_FIELDS, used to spot identical jobs in flight"""
+    fields = {name: getattr(job, name) for name in JOB_SIGNATURE_FIELDS}
+    canonical = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _domain_key(url: str) -> str:
+    """Host of a URL without a leading www., used to key the scrape-mode cache"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _build_filter(items: Tuple[Tuple[str, Any], ...]) -> Callable[[Dict[str, Any]], bool]:
+    """Build a predicate requiring row[key] == value for every (key, value) pair"""
+    if len(items) == 1:
+        (key, value), = items
+        return lambda row: row.get(key) == value
+    keys = tuple(key for key, _ in items)
+    expected = tuple(value for _, value in items)
+    return lambda row: tuple(row.get(key) for key in keys) == expected
+
+
+@lru_cache(maxsize=256)
+def _build_cached_filter(items: frozenset) -> Callable[[Dict[str, Any]], bool]:
+    return _build_filter(tuple(items))
+
+
+def _compile_filter(filters: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile a job's `filters` (key -> expected value) into one predicate over result rows.
+    Predicates are cached per filter set, so repeated jobs don't rebuild them.
+    """
+    try:
+        return _build_cached_filter(frozenset(filters.items()))
+    except TypeError:
+        # Unhashable expected values (lists/dicts) can't be cached - build directly
+        return _build_filter(tuple(filters.items()))
+
 
 class ScraperWorker:
-    def __init__(self, storage_instance=None):
-        self.scraper = WebScraper()
+    def __init__(self, storage_instance=None, max_concurrency: int = AI_FILTER_CONCURRENCY,
+                 limit_per_host: int = MAX_CONCURRENCY_PER_HOST):
+        # One scraper for every job, so the per-host limit holds across concurrent jobs
+        self.scraper = WebScraper(limit_per_host=limit_per_host)
+        # Template for crawl jobs; each job gets a copy with its own limits via with_limits()
+        self.robots_cache = RobotsCache(user_agent=self.scraper.session.headers.get('User-Agent'))
+        self.crawler = WebCrawler(scraper=self.scraper, robots=self.robots_cache)
+        self.max_concurrency = max_concurrency
         self.ai_filter = AIFilter()
         self.storage = storage_instance or Storage()
+        # Job ID -> future for its row, waiting to be marked RUNNING in the next batched update
+        self._status_buffer: Dict[str, asyncio.Future] = {}
+        self._status_flusher: Optional[asyncio.Task] = None
+        # domain -> ('js' or 'static', expires_at): which path last worked for a JavaScript-requested scrape
+        self._mode_cache: Dict[str, Tuple[str, float]] = {}
+        # Job completions still being written in the background
+        self._pending: Set[asyncio.Task] = set()
+        # Job signature -> future resolving to the running job's ID once its results are saved (None if it failed)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def aclose(self) -> None:
+        """Finish background writes and shut down the scraper's shared browser and HTTP session"""
+        if self._pending:
+            await asyncio.gather(*self._pending)
+        if self._status_flusher is not None:
+            self._status_flusher.cancel()
+            try:
+                await self._status_flusher
+            except asyncio.CancelledError:
+                pass
+            self._status_flusher = None
+        # Jobs still waiting were cancelled with the queue runner; leave them pending
+        for future in self._status_buffer.values():
+            future.cancel()
+        self._status_buffer.clear()
+        await self.robots_cache.aclose()
+        await self.scraper.aclose()
+
+    def _remember_mode(self, domain: str, mode: str) -> None:
+        """Record the scrape path that worked for a domain, dropping the oldest entry when full"""
+        self._mode_cache.pop(domain, None)
+        if len(self._mode_cache) >= MODE_CACHE_SIZE:
+            del self._mode_cache[next(iter(self._mode_cache))]
+        self._mode_cache[domain] = (mode, time.monotonic() + MODE_CACHE_TTL)
+
+    def _cached_mode(self, domain: str) -> Optional[str]:
+        """The learned scrape mode for a domain, or None if unknown or expired"""
+        entry = self._mode_cache.get(domain)
+        if entry is None:
+            return None
+        mode, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._mode_cache[domain]
+            return None
+        return mode
+
+    def _mark_running(self, job_id: str) -> asyncio.Future:
+        """
+        Buffer a job's RUNNING status update. The returned future resolves to the updated
+        job row (None if the job doesn't exist or is no longer pending) once the batch is flushed.
+        """
+        future = self._status_buffer.get(job_id)
+        if future is None:
+            future = self._status_buffer[job_id] = asyncio.get_running_loop().create_future()
+        if self._status_flusher is None:
+            self._status_flusher = asyncio.create_task(self._flush_status_periodically())
+        return future
+
+    async def _flush_status_periodically(self) -> None:
+        """Flush the status buffer every STATUS_FLUSH_INTERVAL until it stays empty"""
+        while self._status_buffer:
+            await asyncio.sleep(STATUS_FLUSH_INTERVAL)
+            await self._flush_status_buffer()
+        self._status_flusher = None
+
+    async def _flush_status_buffer(self) -> None:
+        """Mark every buffered job RUNNING in a single request and hand each waiter its row"""
+        if not self._status_buffer:
+            return
+        batch, self._status_buffer = self._status_buffer, {}
+        try:
+            # Only promote jobs still pending, so a job that already failed or finished keeps its status
+            rows = await self.storage.bulk_update_jobs(
+                list(batch),
+                {'status': JobStatus.RUNNING.value},
+                from_status=JobStatus.PENDING.value
+            )
+        except Exception as e:
+            logger.warning("Failed to mark %s jobs as running: %s", len(batch), e)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        rows_by_id = {str(row['id']): row for row in rows}
+        for job_id, future in batch.items():
+            if not future.done():
+                future.set_result(rows_by_id.get(job_id))
+
+    async def run_forever(self, queue: asyncio.Queue, concurrency: int = JOB_CONCURRENCY) -> None:
+        """
+        Process job IDs from the queue until cancelled, up to `concurrency` jobs at a time.
+        All jobs share this worker's scraper, so its browser and HTTP connections are reused.
+        """
+        async def consume():
+            while True:
+                job_id = await queue.get()
+                try:
+                    await self.process_job(job_id)
+                except Exception as e:
+                    logger.error("Unhandled error processing job %s: %s", job_id, e, exc_info=True)
+                finally:
+                    queue.task_done()
+        
+        await asyncio.gather(*(consume() for _ in range(concurrency)))
 
     async def process_job(self, job_id: str) -> None:
         """Process a scraping job"""
-        logger.info(f"Starting to process job {job_id}")
+        logger.info("Starting to process job %s", job_id)
         errors = []
         
         try:
-            # Update job status to running
-            await self.storage.update_job(job_id, {'status': JobStatus.RUNNING.value})
-
-            # Get job details
-            job = await self.storage.get_job(job_id)
-            if not job:
-                raise Exception(f"Job {job_id} not found")
+            # Mark the job running and read it back; batched so a burst of jobs costs one request
+            record = await self._mark_running(job_id)
+            if not record:
+                # Missing, or already picked up / finished - leave its status alone
+                logger.warning("Job %s not found or no longer pending, skipping", job_id)
+                return
+            job = ScrapeJobInternal.from_record(record)
             
-            logger.info(f"Job: mode={'crawl' if job.get('crawl_mode') else 'single'}, url={job.get('url')}, query={job.get('search_query')}")
-
-            filtered_data = []
-            use_javascript = job.get('use_javascript', False)
+            logger.info("Job: mode=%s, url=%s, query=%s", 'crawl' if job.crawl_mode else 'single', job.url, job.search_query)
 
-            # Check if this is a crawl job or single URL job
-            if job.get('crawl_mode'):
-                filtered_data = await self._process_crawl_job(job, errors)
+            # An identical job is already running - wait for it and copy its results instead
+            signature = _job_signature(job)
+            leader = self._inflight.get(signature)
+            if leader is not None:
+                source_job_id = await asyncio.shield(leader)
+                if source_job_id:
+                    await self._copy_results(source_job_id, job_id)
+                    return
+                # It failed; scrape this one independently
+                future = None
             else:
-                filtered_data = await self._process_single_url_job(job, errors)
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[signature] = future
 
-            # If no data scraped, report the errors
-            if not filtered_data:
-                error_msg = "No data could be scraped. "
-                if errors:
-                    error_msg += "Errors: " + "; ".join(errors[:3])  # First 3 errors
-                else:
-                    error_msg += "The target site may be blocking automated access."
-                
+            completion = None
+            try:
+                completion = await self._run_job(job_id, job, errors)
+            finally:
+                if future is not None:
+                    self._settle_inflight(signature, future, job_id, completion)
+
+        except Exception as e:
+            error_msg = str(e)
+            if errors:
+                error_msg += " | Additional errors: " + "; ".join(errors[:2])
+            
+            # Tracebacks only at DEBUG: formatting one per failure adds up when a blocked host fails every job
+            logger.error("Job %s failed (%s): %s", job_id, type(e).__name__, error_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
+            
+            try:
                 await self.storage.update_job(job_id, {
                     'status': JobStatus.FAILED.value,
-                    'error': error_msg
+                    'error': error_msg[:500]  # Limit error length
                 })
-                return
-
-            # Extract from individual pages if requested and we have restaurant data
-            if job.get('extract_individual_pages'):
-                filtered_data = await self._extract_from_individual_pages_if_needed(filtered_data, job, errors)
-
-            # Apply AI filtering if prompt provided
-            if job.get('ai_prompt') and filtered_data:
-                filtered_data = await self._apply_ai_filter(filtered_data, job['ai_prompt'], errors)
+            except Exception as update_error:
+                logger.error("Failed to update job status: %s", update_error)
 
-            # Save results
-            logger.info(f"Saving {len(filtered_data)} results for job {job_id}")
-            await self.storage.save_results(job_id, filtered_data)
+    async def _run_job(self, job_id: str, job: ScrapeJobInternal, errors: List[str]) -> Optional[asyncio.Task]:
+        """
+        Scrape, filter and save a job's results.
+        Returns the background task completing the job, or None if the job failed with no data.
+        """
+        # Check if this is a crawl job or single URL job
+        if job.crawl_mode:
+            filtered_data = await self._process_crawl_job(job, errors)
+        else:
+            filtered_data = await self._process_single_url_job(job, errors)
 
-            # Update job status to completed
+        # If no data scraped, report the errors
+        if not filtered_data:
+            error_msg = "No data could be scraped. "
+            if errors:
+                error_msg += "Errors: " + "; ".join(errors[:3])  # First 3 errors
+            else:
+                error_msg += "The target site may be blocking automated access."
+            
             await self.storage.update_job(job_id, {
-                'status': JobStatus.COMPLETED.value,
-                'completed_at': datetime.utcnow().isoformat()
+                'status': JobStatus.FAILED.value,
+                'error': error_msg
             })
-            logger.info(f"Job {job_id} completed with {len(filtered_data)} results")
+            return None
+
+        # Extract from individual pages if requested and we have restaurant data
+        if job.extract_individual_pages:
+            filtered_data = await self._extract_from_individual_pages_if_needed(filtered_data, job, errors)
+
+        # Keep only rows matching the job's key/value filters
+        matches = _compile_filter(job.filters) if job.filters else None
+        saved = 0
+
+        if job.ai_prompt:
+            # Save AI-filtered rows in batches as they come in; the last batch goes with the completion
+            batch = []
+            # aclosing: if a save fails or the job is cancelled, the filter's pending model calls are cancelled too
+            async with aclosing(self._apply_ai_filter(filtered_data, job.ai_prompt, errors)) as rows:
+                async for row in rows:
+                    if matches and not (isinstance(row, dict) and matches(row)):
+                        continue
+                    batch.append(row)
+                    if len(batch) >= RESULT_BATCH_SIZE:
+                        await self.storage.save_results(job_id, batch)
+                        saved += len(batch)
+                        batch = []
+            filtered_data = batch
+        elif matches:
+            filtered_data = [row for row in filtered_data if isinstance(row, dict) and matches(row)]
+
+        # Save the remaining results and mark the job completed in the background,
+        # so the next job can start without waiting for the write
+        logger.info("Saving %s results for job %s", len(filtered_data), job_id)
+        task = asyncio.create_task(self._complete_job(job_id, filtered_data, saved + len(filtered_data)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    def _settle_inflight(
+        self,
+        signature: str,
+        future: asyncio.Future,
+        job_id: str,
+        completion: Optional[asyncio.Task]
+    ) -> None:
+        """Release jobs waiting on this signature once the job's results are saved (or it has failed)"""
+        def settle(succeeded: bool) -> None:
+            if self._inflight.get(signature) is future:
+                del self._inflight[signature]
+            future.set_result(job_id if succeeded else None)
+        
+        if completion is None:
+            settle(False)
+        else:
+            completion.add_done_callback(lambda task: settle(not task.cancelled() and task.result()))
+
+    async def _copy_results(self, source_job_id: str, job_id: str) -> None:
+        """Complete a job with the results of an identical job that just ran"""
+        count = await self.storage.clone_results(source_job_id, job_id)
+        await self.storage.update_job(job_id, {
+            'status': JobStatus.COMPLETED.value,
+            'completed_at': datetime.utcnow().isoformat()
+        })
+        logger.info("Job %s completed with %s results copied from identical job %s", job_id, count, source_job_id)
 
+    async def _complete_job(self, job_id: str, results: List[Dict], total: int) -> bool:
+        """Save the last results and mark the job completed in one round-trip; mark it failed if that fails"""
+        try:
+            await self.storage.finish_job(
+                job_id,
+                results,
+                status=JobStatus.COMPLETED.value,
+                completed_at=datetime.utcnow().isoformat()
+            )
+            logger.info("Job %s completed with %s results", job_id, total)
+            return True
         except Exception as e:
-            error_msg = str(e)
-            if errors:
-                error_msg += " | Additional errors: " + "; ".join(errors[:2])
-            
-            logger.error(f"Job {job_id} failed: {error_msg}", exc_info=True)
-            
+            logger.error("Failed to save results for job %s: %s", job_id, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             try:
                 await self.storage.update_job(job_id, {
                     'status': JobStatus.FAILED.value,
-                    'error': error_msg[:500]  # Limit error length
+                    'error': f"Failed to save results: {e}"[:500]
                 })
             except Exception as update_error:
-                logger.error(f"Failed to update job status: {update_error}")
+                logger.error("Failed to update job status: %s", update_error)
+            return False
 
-    async def _process_crawl_job(self, job: Dict, errors: List[str]) -> List[Dict]:
+    async def _process_crawl_job(self, job: ScrapeJobInternal, errors: List[str]) -> List[Dict]:
         """Process a crawl mode job"""
-        crawler = WebCrawler(
-            max_pages=job.get('max_pages', 10),
-            max_depth=job.get('max_depth', 2),
-            same_domain=job.get('same_domain', True)
-        )
+        max_pages = job.max_pages
+        use_javascript = job.use_javascript
+        search_query = job.search_query
         
-        use_javascript = job.get('use_javascript', False)
-        search_query = job.get('search_query')
+        crawler = self.crawler.with_limits(
+            max_pages=max_pages,
+            max_depth=job.max_depth,
+            same_domain=job.same_domain
+        )
+        timeout = CRAWL_TIMEOUT + CRAWL_PAGE_BUDGET * crawler.max_pages
         
         try:
             if search_query:
-                logger.info(f"Crawling from search: {search_query}")
+                logger.info("Crawling from search: %s", search_query)
                 
                 # First try with JavaScript if enabled
                 if use_javascript:
                     try:
-                        return await crawler.crawl_from_search(
-                            search_query=search_query,
-                            max_pages=job.get('max_pages', 10),
-                            use_javascript=True
+                        return await asyncio.wait_for(
+                            crawler.crawl_from_search(
+                                search_query=search_query,
+                                max_pages=max_pages,
+                                use_javascript=True
+                            ),
+                            timeout=timeout
                         )
+                    except asyncio.TimeoutError:
+                        # Keep what the browser got rather than starting the whole crawl over
+                        if crawler.results:
+                            errors.append(f"JS crawl timed out after {timeout}s with {len(crawler.results)} pages scraped")
+                            logger.warning("JavaScript crawl timed out after %ss, keeping %s pages", timeout, len(crawler.results))
+                            return crawler.results
+                        errors.append(f"JS crawl timed out after {timeout}s")
+                        logger.warning("JavaScript crawl timed out after %ss, trying without", timeout)
                     except Exception as e:
                         errors.append(f"JS crawl failed: {str(e)[:100]}")
-                        logger.warning(f"JavaScript crawl failed, trying without: {e}")
+                        logger.warning("JavaScript crawl failed, trying without: %s", e)
                 
                 # Try without JavaScript
-                return await crawler.crawl_from_search(
-                    search_query=search_query,
-                    max_pages=job.get('max_pages', 10),
-                    use_javascript=False
+                return await asyncio.wait_for(
+                    crawler.crawl_from_search(
+                        search_query=search_query,
+                        max_pages=max_pages,
+                        use_javascript=False
+                    ),
+                    timeout=timeout
                 )
             else:
                 # Crawl from URL
-                start_urls = [job['url']] if job.get('url') else []
+                start_urls = [job.url] if job.url else []
                 if not start_urls:
                     raise Exception("No URL or search query provided")
                 
-                return await crawler.crawl(
-                    start_urls=start_urls,
-                    use_javascript=use_javascript
+                return await asyncio.wait_for(
+                    crawler.crawl(
+                        start_urls=start_urls,
+                        use_javascript=use_javascript
+                    ),
+                    timeout=timeout
                 )
+        except asyncio.TimeoutError:
+            # The pages scraped before the deadline are still good
+            errors.append(f"Crawl timed out after {timeout}s with {len(crawler.results)} pages scraped")
+            logger.error("Crawl timed out after %ss, keeping %s pages", timeout, len(crawler.results))
+            return crawler.results
         except Exception as e:
             errors.append(str(e)[:200])
-            logger.error(f"Crawl failed: {e}")
+            logger.error("Crawl failed: %s", e)
             return []
 
-    async def _process_single_url_job(self, job: Dict, errors: List[str]) -> List[Dict]:
+    async def _process_single_url_job(self, job: ScrapeJobInternal, errors: List[str]) -> List[Dict]:
         """Process a single URL scrape job"""
-        if not job.get('url'):
+        if not job.url:
             raise Exception("URL is required for single page scraping")
         
-        url = job['url']
-        use_javascript = job.get('use_javascript', False)
-        extract_individual_pages = job.get('extract_individual_pages', True)  # DEFAULT: enabled
+        url = job.url
+        use_javascript = job.use_javascript
+        extract_individual_pages = job.extract_individual_pages  # DEFAULT: enabled
         
-        logger.info(f"Scraping: {url} (JS: {use_javascript}, Individual Pages: {extract_individual_pages})")
+        logger.info("Scraping: %s (JS: %s, Individual Pages: %s)", url, use_javascript, extract_individual_pages)
         
         # Check if this is a restaurant listing page
         is_restaurant_listing = self._is_restaurant_listing_page(url)
@@ -161,28 +474,48 @@ class ScraperWorker:
         if extract_individual_pages and is_restaurant_listing:
             return await self._process_restaurant_listing_with_individual_pages(url, use_javascript, errors)
         
+        domain = _domain_key(url)
+        js_failed = False
+        
         # Check for special site handling
-        if 'opentable.com' in url.lower():
-            use_javascript = True  # OpenTable always needs JS
-            logger.info("Detected OpenTable - using JavaScript rendering")
+        flags = site_flags(urlsplit(url).hostname or '')
+        if 'use_javascript' in flags:
+            use_javascript = flags['use_javascript']
+            logger.info("Site rules for %s: use_javascript=%s", domain, use_javascript)
+        elif use_javascript and self._cached_mode(domain) == 'static':
+            # The browser failed here before and a plain fetch worked - skip its startup cost
+            logger.info("Skipping JavaScript rendering for %s: static scraping worked last time", domain)
+            use_javascript = False
         
         try:
             # Try with JavaScript first if enabled
             if use_javascript:
                 try:
-                    data = await self.scraper.scrape(url, use_javascript=True)
+                    data = await asyncio.wait_for(self.scraper.scrape(url, use_javascript=True), timeout=PAGE_TIMEOUT)
+                    self._remember_mode(domain, 'js')
                     return [data]
+                except asyncio.TimeoutError:
+                    # A slow or busy browser says nothing about the site - don't learn 'static' from it
+                    errors.append(f"JS scrape timed out after {PAGE_TIMEOUT}s")
+                    logger.warning("JavaScript scraping timed out after %ss, trying static", PAGE_TIMEOUT)
                 except Exception as e:
+                    js_failed = True
                     errors.append(f"JS scrape failed: {str(e)[:100]}")
-                    logger.warning(f"JavaScript scraping failed, trying static: {e}")
+                    logger.warning("JavaScript scraping failed, trying static: %s", e)
             
             # Try static scraping
-            data = await self.scraper.scrape(url, use_javascript=False)
+            data = await asyncio.wait_for(self.scraper.scrape(url, use_javascript=False), timeout=PAGE_TIMEOUT)
+            if js_failed and not data.get('rendered_with_javascript'):
+                self._remember_mode(domain, 'static')
             return [data]
             
+        except asyncio.TimeoutError:
+            errors.append(f"Scrape timed out after {PAGE_TIMEOUT}s")
+            logger.error("Scraping %s timed out after %ss", url, PAGE_TIMEOUT)
+            return []
         except Exception as e:
             errors.append(str(e)[:200])
-            logger.error(f"Scraping failed for {url}: {e}")
+            logger.error("Scraping failed for %s: %s", url, e)
             return []
     
     def _is_restaurant_listing_page(self, url: str) -> bool:
@@ -220,7 +553,7 @@ class ScraperWorker:
         3. Extract ALL data from individual pages
         4. Return combined list
         """
-        logger.info(f"Using default process: Extract URLs → Visit individual pages → Get complete data")
+        logger.info("Using default process: Extract URLs → Visit individual pages → Get complete data")
         
         try:
             # STEP 1: Extract restaurant URLs from listing page
@@ -236,7 +569,7 @@ class ScraperWorker:
                 data = await self.scraper.scrape(listing_url, use_javascript=use_javascript)
                 return [data]
             
-            logger.info(f"Step 1 Complete: Found {len(restaurant_urls)} restaurant URLs")
+            logger.info("Step 1 Complete: Found %s restaurant URLs", len(restaurant_urls))
             
             # STEP 2: Create minimal restaurant objects with just URLs
             restaurants_with_urls = [
@@ -245,14 +578,14 @@ class ScraperWorker:
             ]
             
             # STEP 3: Visit each individual page and extract ALL data
-            logger.info(f"Step 2: Visiting {len(restaurants_with_urls)} individual restaurant pages...")
+            logger.info("Step 2: Visiting %s individual restaurant pages...", len(restaurants_with_urls))
             detailed_restaurants = await self.scraper.extract_from_individual_pages(
                 restaurants=restaurants_with_urls,
                 use_javascript=True,  # Always use JS for individual pages
                 max_concurrent=5
             )
             
-            logger.info(f"Step 2 Complete: Extracted data from {len(detailed_restaurants)} individual pages")
+            logger.info("Step 2 Complete: Extracted data from %s individual pages", len(detailed_restaurants))
             
             # STEP 4: Return combined list
             return detailed_restaurants
@@ -260,7 +593,7 @@ class ScraperWorker:
         except Exception as e:
             error_msg = f"Restaurant listing process failed: {str(e)[:200]}"
             errors.append(error_msg)
-            logger.error(error_msg, exc_info=True)
+            logger.error(error_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
             # Fallback to regular scraping
             try:
                 data = await self.scraper.scrape(listing_url, use_javascript=use_javascript)
@@ -268,31 +601,53 @@ class ScraperWorker:
             except:
                 return []
 
-    async def _apply_ai_filter(self, data: List[Dict], prompt: str, errors: List[str]) -> List[Dict]:
-        """Apply AI filtering to scraped data"""
-        logger.info(f"Applying AI filter to {len(data)} items")
+    async def _apply_ai_filter(self, data: List[Dict], prompt: str, errors: List[str]) -> AsyncIterator[Dict]:
+        """Apply AI filtering to scraped data, yielding results in page order as soon as they're ready"""
+        logger.info("Applying AI filter to %s pages", len(data))
+        started = time.perf_counter()
+        failed = 0
         
-        ai_filtered = []
-        for idx, page_data in enumerate(data):
-            try:
-                result = await self.ai_filter.filter_and_structure(page_data, prompt)
-                if isinstance(result, list):
-                    ai_filtered.extend(result)
-                else:
-                    ai_filtered.append(result)
-            except Exception as e:
-                errors.append(f"AI filter error on item {idx+1}: {str(e)[:50]}")
-                logger.warning(f"AI filtering failed for item {idx + 1}: {e}")
-                # Include original data if AI fails
-                ai_filtered.append(page_data)
+        # Pages are independent - run the model calls concurrently, a bounded number at a time
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        logger.info(f"AI filtering complete: {len(ai_filtered)} items")
-        return ai_filtered if ai_filtered else data
+        async def filter_one(idx: int, page_data: Dict) -> List[Dict]:
+            nonlocal failed
+            async with semaphore:
+                try:
+                    result = await self.ai_filter.filter_and_structure(page_data, prompt)
+                    return result if isinstance(result, list) else [result]
+                except Exception as e:
+                    failed += 1
+                    errors.append(f"AI filter error on item {idx+1}: {str(e)[:50]}")
+                    logger.debug("AI filtering failed for item %s: %s", idx + 1, e)
+                    # Include original data if AI fails
+                    return [page_data]
+        
+        tasks = [asyncio.create_task(filter_one(idx, page_data)) for idx, page_data in enumerate(data)]
+        produced = 0
+        try:
+            # All pages run concurrently; awaiting in order releases each page once those before it are done
+            for task in tasks:
+                for item in await task:
+                    produced += 1
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        # One summary line per job; per-page failures are logged at DEBUG and kept in `errors`
+        logger.info(
+            "AI filtering complete in %.2fs: %s pages ok, %s failed, %s items",
+            time.perf_counter() - started, len(data) - failed, failed, produced
+        )
+        if not produced:
+            for page_data in data:
+                yield page_data
 
     async def _extract_from_individual_pages_if_needed(
         self, 
         data: List[Dict], 
-        job: Dict, 
+        job: ScrapeJobInternal, 
         errors: List[str]
     ) -> List[Dict]:
         """
@@ -301,7 +656,7 @@ class ScraperWorker:
         2. We have restaurant data with URLs
         """
         # Default to True if not specified (new default behavior)
-        if job.get('extract_individual_pages') is False:
+        if not job.extract_individual_pages:
             return data
         
         # Check if we have restaurant data
@@ -346,17 +701,17 @@ class ScraperWorker:
             logger.info("No restaurant URLs found for individual page extraction")
             return data
         
-        logger.info(f"Extracting detailed data from {len(restaurants_with_urls)} individual restaurant pages")
+        logger.info("Extracting detailed data from %s individual restaurant pages", len(restaurants_with_urls))
         
         try:
-            use_javascript = job.get('use_javascript', True)  # Default to True for individual pages
+            use_javascript = job.use_javascript
             detailed_restaurants = await self.scraper.extract_from_individual_pages(
                 restaurants=restaurants_with_urls,
                 use_javascript=use_javascript,
                 max_concurrent=5
             )
             
-            logger.info(f"Successfully extracted data from {len(detailed_restaurants)} individual pages")
+            logger.info("Successfully extracted data from %s individual pages", len(detailed_restaurants))
             
             # Replace original restaurant data with detailed data
             # Keep non-restaurant data items
@@ -394,6 +749,6 @@ class ScraperWorker:
         except Exception as e:
             error_msg = f"Failed to extract from individual pages: {str(e)[:200]}"
             errors.append(error_msg)
-            logger.error(error_msg, exc_info=True)
+            logger.error(error_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
             # Return original data if extraction fails
             return data
@@ -48,3 +48,19 @@ COMMENT ON COLUMN scrape_jobs.same_domain IS 'Only crawl pages on the same domai
 COMMENT ON COLUMN scrape_jobs.use_javascript IS 'Use Playwright for JavaScript-rendered pages';
 COMMENT ON COLUMN scrape_jobs.extract_individual_pages IS 'Extract data from individual restaurant pages (default: true for restaurant listings)';
 
+-- Step 5: Save results and complete a job in one transaction (called by the worker)
+CREATE OR REPLACE FUNCTION finish_job(
+    p_job_id UUID,
+    p_status TEXT,
+    p_completed_at TIMESTAMP WITH TIME ZONE,
+    p_results JSONB
+) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO scrape_results (job_id, data)
+    SELECT p_job_id, value FROM jsonb_array_elements(COALESCE(p_results, '[]'::jsonb));
+
+    UPDATE scrape_jobs
+    SET status = p_status, completed_at = p_completed_at
+    WHERE id = p_job_id;
+END;
+$$ LANGUAGE plpgsql;
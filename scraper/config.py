@@ -116,6 +116,7 @@ class ScraperConfig:
     max_retries: int = 3
     retry_backoff_factor: float = 2.0
     request_timeout: int = 30  # seconds
+    max_concurrent_requests: int = 3  # URLs fetched at once; each host still gets the delay between requests
     
     # Browser Configuration
     headless: bool = True
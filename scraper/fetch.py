@@ -92,7 +92,11 @@ class Fetcher:
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.playwright = None
-        self.consecutive_errors = 0
+        # Per host, so concurrent fetches to different sites don't reset each other's streak
+        self.consecutive_errors: Dict[str, int] = {}
+        # Politeness delay is per host: fetches to one host are spaced out, other hosts proceed
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._next_request_at: Dict[str, float] = {}
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -127,6 +131,20 @@ class Fetcher:
         if self.playwright:
             await self.playwright.stop()
     
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+    
+    async def _wait_for_turn(self, url: str) -> None:
+        """Sleep until the politeness delay since the last request to this URL's host has passed"""
+        host = self._host(url)
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            wait = self._next_request_at.get(host, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_request_at[host] = time.monotonic() + self.config.get_delay()
+    
     def _detect_captcha(self, html: str) -> bool:
         """Detect CAPTCHA in HTML"""
         captcha_indicators = [
@@ -207,7 +225,7 @@ class Fetcher:
                 if self._detect_bot_challenge(html):
                     raise BotChallengeError("Bot challenge detected")
                 
-                self.consecutive_errors = 0
+                self.consecutive_errors.pop(self._host(url), None)
                 
                 metadata = {
                     "url": url,
@@ -223,9 +241,10 @@ class Fetcher:
                 
         except httpx.HTTPStatusError as e:
             if e.response.status_code in [403, 429]:
-                self.consecutive_errors += 1
-                if self.consecutive_errors >= self.config.max_consecutive_errors:
-                    raise FetchError(f"Too many consecutive errors: {self.consecutive_errors}")
+                host = self._host(url)
+                errors = self.consecutive_errors[host] = self.consecutive_errors.get(host, 0) + 1
+                if errors >= self.config.max_consecutive_errors:
+                    raise FetchError(f"Too many consecutive errors for {host}: {errors}")
             
             if retry_count < self.config.max_retries:
                 backoff = self.config.retry_backoff_factor ** retry_count
@@ -310,7 +329,7 @@ class Fetcher:
             if self._detect_bot_challenge(html):
                 raise BotChallengeError("Bot challenge detected")
             
-            self.consecutive_errors = 0
+            self.consecutive_errors.pop(self._host(url), None)
             
             metadata = {
                 "url": url,
@@ -354,7 +373,7 @@ class Fetcher:
             Tuple of (HTML content, metadata)
         """
         # Rate limiting
-        await asyncio.sleep(self.config.get_delay())
+        await self._wait_for_turn(url)
         
         if use_dynamic or self.browser:
             return await self.fetch_dynamic(url)
@@ -7,7 +7,7 @@ import asyncio
 import logging
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import quote_plus
 
 from rich.console import Console
@@ -65,7 +65,8 @@ async def scrape_from_urls(
     fetcher: Fetcher
 ) -> List[Dict[str, Any]]:
     """Scrape data from a list of URLs"""
-    all_data = []
+    # Independent URLs are fetched concurrently (pages share the fetcher's browser context)
+    semaphore = asyncio.Semaphore(max(1, config.max_concurrent_requests))
     
     with Progress(
         SpinnerColumn(),
@@ -74,58 +75,53 @@ async def scrape_from_urls(
     ) as progress:
         task = progress.add_task("Scraping URLs...", total=len(urls))
         
-        for url in urls:
-            try:
-                progress.update(task, description=f"Fetching {url[:50]}...")
-                
-                # Determine source from URL
-                if 'google.com/maps' in url or 'maps.google.com' in url:
-                    source = 'Google Maps'
-                    parser = parse_google_maps
-                elif 'yelp.com' in url:
-                    source = 'Yelp'
-                    parser = parse_yelp
-                elif 'opentable.com' in url:
-                    source = 'OpenTable'
-                    parser = parse_opentable
-                else:
-                    source = 'Official Website'
-                    parser = parse_official_website
-                
-                if source not in sources:
-                    progress.advance(task)
-                    continue
-                
-                # Fetch
-                html, metadata = await fetcher.fetch(url, use_dynamic=True)
-                
-                # Parse
-                parsed_data = parser(html, url)
-                all_data.append(parsed_data)
-                
-                progress.advance(task)
-                
-            except (CaptchaDetectedError, BotChallengeError) as e:
-                console.print(f"[yellow]⚠ Skipping {url}: {e}[/yellow]")
-                progress.advance(task)
-                continue
-            except RateLimitError as e:
-                console.print(f"[red]⚠ Rate limited on {url}: {e}[/red]")
-                progress.advance(task)
-                continue
-            except FetchError as e:
-                console.print(f"[red]✗ Failed {url}: {e}[/red]")
-                progress.advance(task)
-                continue
-            except Exception as e:
-                console.print(f"[red]✗ Error on {url}: {e}[/red]")
-                if config.debug_mode:
-                    import traceback
-                    console.print(traceback.format_exc())
+        async def scrape_one(url: str) -> Optional[Dict[str, Any]]:
+            # Determine source from URL
+            if 'google.com/maps' in url or 'maps.google.com' in url:
+                source = 'Google Maps'
+                parser = parse_google_maps
+            elif 'yelp.com' in url:
+                source = 'Yelp'
+                parser = parse_yelp
+            elif 'opentable.com' in url:
+                source = 'OpenTable'
+                parser = parse_opentable
+            else:
+                source = 'Official Website'
+                parser = parse_official_website
+            
+            if source not in sources:
                 progress.advance(task)
-                continue
+                return None
+            
+            async with semaphore:
+                try:
+                    progress.update(task, description=f"Fetching {url[:50]}...")
+                    
+                    # Fetch
+                    html, metadata = await fetcher.fetch(url, use_dynamic=True)
+                    
+                    # Parse
+                    return parser(html, url)
+                    
+                except (CaptchaDetectedError, BotChallengeError) as e:
+                    console.print(f"[yellow]⚠ Skipping {url}: {e}[/yellow]")
+                except RateLimitError as e:
+                    console.print(f"[red]⚠ Rate limited on {url}: {e}[/red]")
+                except FetchError as e:
+                    console.print(f"[red]✗ Failed {url}: {e}[/red]")
+                except Exception as e:
+                    console.print(f"[red]✗ Error on {url}: {e}[/red]")
+                    if config.debug_mode:
+                        import traceback
+                        console.print(traceback.format_exc())
+                finally:
+                    progress.advance(task)
+            return None
+        
+        results = await asyncio.gather(*(scrape_one(url) for url in urls))
     
-    return all_data
+    return [data for data in results if data is not None]
 
 
 async def scrape_from_search(
@@ -94,6 +94,42 @@ CREATE INDEX IF NOT EXISTS idx_scrape_results_job_id ON scrape_results(job_id);
 CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status ON scrape_jobs(status);
 CREATE INDEX IF NOT EXISTS idx_scrape_jobs_created_at ON scrape_jobs(created_at);
 
+-- Step 5b: Save results and complete a job in one transaction (called by the worker)
+CREATE OR REPLACE FUNCTION finish_job(
+    p_job_id UUID,
+    p_status TEXT,
+    p_completed_at TIMESTAMP WITH TIME ZONE,
+    p_results JSONB
+) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO scrape_results (job_id, data)
+    SELECT p_job_id, value FROM jsonb_array_elements(COALESCE(p_results, '[]'::jsonb));
+
+    UPDATE scrape_jobs
+    SET status = p_status, completed_at = p_completed_at
+    WHERE id = p_job_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Step 5c: Copy one job's results to another server-side (used when identical jobs are deduplicated)
+CREATE OR REPLACE FUNCTION clone_results(
+    p_source_job_id UUID,
+    p_job_id UUID
+) RETURNS INTEGER AS $$
+DECLARE
+    copied INTEGER;
+BEGIN
+    INSERT INTO scrape_results (job_id, data, created_at)
+    SELECT p_job_id, data, created_at
+    FROM scrape_results
+    WHERE job_id = p_source_job_id
+    ORDER BY created_at, id;
+
+    GET DIAGNOSTICS copied = ROW_COUNT;
+    RETURN copied;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Step 6: Add column comments for documentation
 COMMENT ON COLUMN scrape_jobs.crawl_mode IS 'Enable web crawling mode to discover and scrape multiple pages';
 COMMENT ON COLUMN scrape_jobs.search_query IS 'Search query for finding pages to crawl or keyword-based searches';
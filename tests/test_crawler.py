@@ -0,0 +1,47 @@
+import pytest
+from app.crawler import BloomFilter, WebCrawler
+
+
+def test_bloom_filter_membership():
+    seen = BloomFilter(capacity=100)
+    seen.add('https://example.com/a')
+
+    assert 'https://example.com/a' in seen
+    assert 'https://example.com/b' not in seen
+
+
+def test_bloom_filter_has_no_false_negatives_at_capacity():
+    urls = [f'https://example.com/page/{i}' for i in range(5000)]
+    seen = BloomFilter(capacity=len(urls))
+    for url in urls:
+        seen.add(url)
+
+    assert all(url in seen for url in urls)
+
+
+def test_bloom_filter_false_positive_rate_at_capacity():
+    seen = BloomFilter(capacity=10000, error_rate=0.01)
+    for i in range(10000):
+        seen.add(f'https://example.com/in/{i}')
+
+    false_positives = sum(f'https://example.com/out/{i}' in seen for i in range(10000))
+    assert false_positives / 10000 < 0.02
+
+
+class _FakeScraper:
+    async def scrape(self, url, use_javascript=False):
+        return {'url': url, 'text_content': '', 'links': {'hrefs': []}}
+
+
+@pytest.mark.asyncio
+async def test_crawl_from_search_sizes_visited_filter_from_its_max_pages(monkeypatch):
+    crawler = WebCrawler(max_pages=10, scraper=_FakeScraper())
+
+    async def search_web(query, max_results):
+        return ['https://example.com/']
+    monkeypatch.setattr(crawler, '_search_web', search_web)
+
+    results = await crawler.crawl_from_search('python tutorials', max_pages=50)
+
+    assert [r['url'] for r in results] == ['https://example.com/']
+    assert crawler.visited_urls.capacity == 50 * 100
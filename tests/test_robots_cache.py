@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app import robots_cache
+from app.robots_cache import RobotsCache
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /private\n"
+
+
+def _cache_with_transport(handler, **kwargs):
+    cache = RobotsCache(**kwargs)
+    cache._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_fetch_robots_once_per_host():
+    fetches = []
+
+    async def handler(request):
+        fetches.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, text=ROBOTS_TXT)
+
+    cache = _cache_with_transport(handler)
+    allowed = await asyncio.gather(
+        *(cache.allowed(f'https://example.com/page/{i}') for i in range(10)),
+        cache.allowed('https://example.com/private/x'),
+    )
+    await cache.aclose()
+
+    assert fetches == ['https://example.com/robots.txt']
+    assert allowed == [True] * 10 + [False]
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(robots_cache.time, 'monotonic', lambda: now[0])
+    fetches = []
+
+    async def handler(request):
+        fetches.append(str(request.url))
+        return httpx.Response(200, text=ROBOTS_TXT)
+
+    cache = _cache_with_transport(handler, ttl=60)
+    await cache.allowed('https://example.com/a')
+    now[0] += 59
+    await cache.allowed('https://example.com/b')
+    now[0] += 2
+    await cache.allowed('https://example.com/c')
+    await cache.aclose()
+
+    assert len(fetches) == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_host_is_evicted_at_capacity():
+    fetches = []
+
+    async def handler(request):
+        fetches.append(request.url.host)
+        return httpx.Response(404)
+
+    cache = _cache_with_transport(handler, maxsize=2)
+    await cache.allowed('https://a.com/')
+    await cache.allowed('https://b.com/')
+    await cache.allowed('https://a.com/again')  # a.com is now the most recently used
+    await cache.allowed('https://c.com/')       # evicts b.com
+    await cache.allowed('https://a.com/third')
+    await cache.allowed('https://b.com/again')
+    await cache.aclose()
+
+    assert fetches == ['a.com', 'b.com', 'c.com', 'b.com']
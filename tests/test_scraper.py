@@ -7,3 +7,91 @@ async def test_scraper_basic():
     scraper = WebScraper()
     # Add tests here
     assert scraper is not None
+
+
+def test_extract_structured_data_dedupes_links_and_images():
+    from bs4 import BeautifulSoup
+
+    html = """
+    <html><body>
+      <a href="/menu">Menu</a>
+      <a href="/menu">Menu again</a>
+      <a href="https://example.com/menu">Absolute menu</a>
+      <a href="/about">About</a>
+      <img src="/logo.png" alt="Logo">
+      <img src="/logo.png" alt="Logo again">
+    </body></html>
+    """
+    scraper = WebScraper()
+    data = scraper._extract_structured_data(
+        BeautifulSoup(html, 'html.parser'), 'https://example.com/', html
+    )
+
+    assert data['links']['hrefs'] == [
+        'https://example.com/menu',
+        'https://example.com/about',
+    ]
+    assert data['links']['texts'] == ['Menu', 'About']
+    assert data['images']['srcs'] == ['https://example.com/logo.png']
+    assert data['images']['alts'] == ['Logo']
+
+
+def test_extract_structured_data_skips_scripts_and_keeps_json_ld():
+    from bs4 import BeautifulSoup
+
+    html = """
+    <html><head>
+      <script type="application/ld+json">{"@type": "Restaurant", "name": "Bistro"}</script>
+      <script>var hidden = "script text";</script>
+    </head><body>
+      <noscript><a href="/no-js">Enable JavaScript</a></noscript>
+      <main><h1>Bistro</h1><p>Open daily</p></main>
+    </body></html>
+    """
+    scraper = WebScraper()
+    data = scraper._extract_structured_data(
+        BeautifulSoup(html, 'html.parser'), 'https://example.com/', html
+    )
+
+    assert data['structured_data'] == [{'@type': 'Restaurant', 'name': 'Bistro'}]
+    assert data['links']['hrefs'] == []
+    assert 'Enable JavaScript' not in data['text_content']
+    assert 'script text' not in data['text_content']
+    assert data['title'] == 'Bistro'
+    assert data['main_content'] == 'Bistro Open daily'
+
+
+def test_extract_businesses_from_listing_reads_parallel_link_arrays():
+    from app.ai_filter import AIFilter
+
+    data = {
+        'headings': {'h3': ['1. Taste of Texas', '2. Steak 48']},
+        'main_content': '',
+        'images': {'srcs': [], 'alts': [], 'titles': []},
+        'links': {
+            'texts': ['Taste of Texas', 'Steakhouse', 'Steak 48'],
+            'hrefs': [
+                'https://example.com/biz/taste-of-texas',
+                'https://example.com/c/steakhouse',
+                'https://example.com/biz/steak-48',
+            ],
+            'titles': ['', '', ''],
+        },
+    }
+    businesses = AIFilter()._extract_businesses_from_listing(data)
+
+    names = [b['name'] for b in businesses]
+    assert names == ['Taste of Texas', 'Steak 48']
+    assert all(b['categories'] == ['Steakhouse'] for b in businesses)
+
+
+@pytest.mark.asyncio
+async def test_http_client_created_on_first_use():
+    scraper = WebScraper()
+    assert scraper._client is None
+
+    client = scraper._get_client()
+    assert scraper._get_client() is client
+
+    await scraper.aclose()
+    assert scraper._client is None